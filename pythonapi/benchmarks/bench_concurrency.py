@@ -0,0 +1,243 @@
+"""
+Benchmark for request latency under concurrent mixed read/write load.
+
+Serves the same handlers, an assignment list read (joined with course names, like /api/assignments),
+an exam insert (like POST /api/exams), a slow report query (an unindexed self-join over the assignments)
+and a ping that does no DB work (like /api/auth/verify or an SSE keep-alive), once with the blocking Session
+inside async def routes (as the endpoints used to) and once from plain def routes, which FastAPI runs in its
+threadpool (as the endpoints do now). Each app gets the same open-loop stream of requests in-process, and
+p50/p95/p99 latency is reported per request kind, for a mix of short queries only and for the same mix with
+a few slow reports. A blocking DB call stalls the event loop for every request in flight, which shows up in
+the tail of every other request once one of them is slow. Single runs are noisy, so the apps take turns for
+ROUNDS rounds and the median of each percentile is reported.
+
+Run from the pythonapi directory:
+    python benchmarks/bench_concurrency.py
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, time as dt_time, timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import Base
+from schemas.assignment_model import Assignment
+from schemas.course_model import Course
+from schemas.exam_model import Exam
+# the rest of the models, so every relationship and foreign key resolves
+from schemas.change_log_model import ChangeLog  # noqa: F401
+from schemas.course_occurrence_model import CourseOccurrence  # noqa: F401
+from schemas.student_course_model import StudentCourse  # noqa: F401
+from schemas.student_model import Student  # noqa: F401
+from schemas.user_model import User  # noqa: F401
+from utilities.format_assignment import load_assignment_events
+
+COURSES = 40
+ASSIGNMENTS_PER_COURSE = 50
+REQUESTS = 2000
+ARRIVALS_PER_SECOND = 150
+# share of each request kind in the mix (the rest are reads)
+WRITE_RATIO = 0.2
+PING_RATIO = 0.2
+# (label, share of slow reports in the mix)
+SCENARIOS = (("short queries only", 0.0), ("with 1% slow report queries", 0.01))
+ROUNDS = 5
+
+# Assignments due within two weeks of each assignment, per course: a self-join no index can serve (~100 ms here)
+REPORT_QUERY = text(
+    "SELECT a.courseId, count(*) FROM assignment a "
+    "JOIN assignment b ON b.dueDate BETWEEN a.dueDate AND date(a.dueDate, '+14 days') "
+    "GROUP BY a.courseId"
+)
+
+
+def seed(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        for i in range(COURSES):
+            course = Course(courseName=f"BENCH{i:03d}", credits=3, startDate=date(2026, 1, 5),
+                            endDate=date(2026, 4, 30), daysOfWeek="M,W", startTime=dt_time(8, 0),
+                            endTime=dt_time(10, 0))
+            course.assignments = [
+                Assignment(assignmentTitle=f"A{i}-{j}", dueDate=date(2026, 1, 5) + timedelta(days=j % 100),
+                           dueTime=dt_time(23, 59))
+                for j in range(ASSIGNMENTS_PER_COURSE)
+            ]
+            session.add(course)
+        session.commit()
+        # as the app does (see database.db)
+        session.execute(text("PRAGMA journal_mode=WAL"))
+    engine.dispose()
+
+
+def window(course_id):
+    return (Assignment.courseId == course_id, Assignment.dueDate >= date(2026, 2, 1),
+            Assignment.dueDate <= date(2026, 3, 31))
+
+
+def make_new_exam(course_id):
+    return Exam(title="Quiz", dateOf=date(2026, 3, 1), weight=5, courseId=course_id)
+
+
+def run_report(session):
+    return [{"courseId": course_id, "crowded": count} for course_id, count in session.execute(REPORT_QUERY)]
+
+
+def blocking_app(path):
+    """The old pattern: async def routes doing blocking Session calls on the event loop"""
+    Session = sessionmaker(bind=create_engine(f"sqlite:///{path}"), expire_on_commit=False)
+    app = FastAPI()
+
+    @app.get("/read/{course_id}")
+    async def read(course_id: int):
+        with Session() as session:
+            return load_assignment_events(session, *window(course_id))
+
+    @app.post("/write/{course_id}")
+    async def write(course_id: int):
+        with Session() as session:
+            exam = make_new_exam(course_id)
+            session.add(exam)
+            session.commit()
+            return {"id": exam.id}
+
+    @app.get("/report")
+    async def report():
+        with Session() as session:
+            return run_report(session)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def threadpool_app(path):
+    """The new pattern: the same blocking Session calls from def routes, which FastAPI runs in its threadpool"""
+    Session = sessionmaker(bind=create_engine(f"sqlite:///{path}"), expire_on_commit=False)
+    app = FastAPI()
+
+    @app.get("/read/{course_id}")
+    def read(course_id: int):
+        with Session() as session:
+            return load_assignment_events(session, *window(course_id))
+
+    @app.post("/write/{course_id}")
+    def write(course_id: int):
+        with Session() as session:
+            exam = make_new_exam(course_id)
+            session.add(exam)
+            session.commit()
+            return {"id": exam.id}
+
+    @app.get("/report")
+    def report():
+        with Session() as session:
+            return run_report(session)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def pick_kind(rng, report_ratio):
+    draw = rng.random()
+    if draw < report_ratio:
+        return "report"
+    if draw < report_ratio + WRITE_RATIO:
+        return "write"
+    if draw < report_ratio + WRITE_RATIO + PING_RATIO:
+        return "ping"
+    return "read"
+
+
+async def run_load(app, report_ratio):
+    """
+    Open-loop load: requests arrive on a fixed schedule whether or not earlier ones have finished,
+    and each latency is measured from its scheduled arrival, so time spent queued behind a stalled
+    event loop is counted.
+    """
+    latencies = {"read": [], "write": [], "ping": []}
+    if report_ratio:
+        latencies["report"] = []
+    rng = random.Random(42)
+    plan = [(pick_kind(rng, report_ratio), rng.randint(1, COURSES)) for _ in range(REQUESTS)]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def send(kind, course_id, due):
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            if kind == "read":
+                response = await client.get(f"/read/{course_id}")
+            elif kind == "write":
+                response = await client.post(f"/write/{course_id}")
+            elif kind == "report":
+                response = await client.get("/report")
+            else:
+                response = await client.get("/ping")
+            response.raise_for_status()
+            latencies[kind].append((time.perf_counter() - due) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            send(kind, course_id, started + i / ARRIVALS_PER_SECOND) for i, (kind, course_id) in enumerate(plan)
+        ))
+
+    return latencies
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies):
+    """{kind: (p50, p95, p99)} of one run, with "all" for every request together"""
+    every = [value for values in latencies.values() for value in values]
+    return {kind: (statistics.median(values), percentile(values, 0.95), percentile(values, 0.99))
+            for kind, values in (("all", every), *latencies.items())}
+
+
+def report(label, runs):
+    """Prints the median over the runs of each percentile"""
+    print(f"\n{label}: median of {len(runs)} runs")
+    for kind in runs[0]:
+        p50, p95, p99 = (statistics.median(run[kind][i] for run in runs) for i in range(3))
+        print(f"  {kind:6s} p50 {p50:8.2f} ms   p95 {p95:8.2f} ms   p99 {p99:8.2f} ms")
+
+
+def main():
+    print(f"{REQUESTS} requests arriving at {ARRIVALS_PER_SECOND}/s, {WRITE_RATIO:.0%} writes, "
+          f"{PING_RATIO:.0%} pings, {COURSES * ASSIGNMENTS_PER_COURSE} assignments")
+
+    apps = (("blocking Session in async def", blocking_app), ("def routes in the threadpool", threadpool_app))
+    for scenario, report_ratio in SCENARIOS:
+        runs = {label: [] for label, _ in apps}
+        for _ in range(ROUNDS):
+            for label, build_app in apps:
+                with tempfile.TemporaryDirectory() as work:
+                    path = os.path.join(work, "bench.db")
+                    seed(path)
+                    latencies = asyncio.run(run_load(build_app(path), report_ratio))
+                    runs[label].append(summarize(latencies))
+
+        print(f"\n== {scenario}")
+        for label, _ in apps:
+            report(label, runs[label])
+
+
+if __name__ == "__main__":
+    main()
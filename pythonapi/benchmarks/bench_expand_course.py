@@ -0,0 +1,85 @@
+"""
+Benchmark for course occurrence generation.
+
+Compares the original day-by-day walk, the weekday-stepping course_dates generator and the
+NumPy batch_course_dates path on multi-year and many-course inputs.
+
+Run from the pythonapi directory:
+    python benchmarks/bench_expand_course.py
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.expand_course import course_dates, batch_course_dates
+
+DAY_CODES = ["M", "Tu", "W", "Th", "F"]
+
+
+def day_by_day_dates(course):
+    """The original expand_course loop: visit every day and test the day codes"""
+    dates = []
+    current = course.startDate
+    one_day = timedelta(days=1)
+    while current <= course.endDate:
+        weekday_number = current.weekday()
+        if (("M" in course.daysOfWeek and weekday_number == 0) or
+            ("Tu" in course.daysOfWeek and weekday_number == 1) or
+            ("W" in course.daysOfWeek and weekday_number == 2) or
+            ("Th" in course.daysOfWeek and weekday_number == 3) or
+            ("F" in course.daysOfWeek and weekday_number == 4)):
+            dates.append(current)
+        current += one_day
+    return dates
+
+
+def make_course(course_id, start_date, length_days, rng):
+    days = sorted(rng.sample(range(5), rng.randint(1, 3)))
+    return SimpleNamespace(
+        id=course_id,
+        courseName=f"COURSE{course_id}",
+        startDate=start_date,
+        endDate=start_date + timedelta(days=length_days),
+        daysOfWeek=",".join(DAY_CODES[d] for d in days),
+        startTime=time(9, 0),
+        endTime=time(10, 0)
+    )
+
+
+def run_case(name, courses, repeat=5):
+    expected = [day_by_day_dates(course) for course in courses]
+    assert [list(course_dates(course)) for course in courses] == expected
+    assert batch_course_dates(courses) == expected
+
+    cases = {
+        "day-by-day loop": lambda: [day_by_day_dates(course) for course in courses],
+        "weekday stepping": lambda: [list(course_dates(course)) for course in courses],
+        "numpy batch": lambda: batch_course_dates(courses),
+    }
+
+    meetings = sum(len(dates) for dates in expected)
+    print(f"\n{name}: {len(courses)} course(s), {meetings} meetings")
+    baseline = None
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:<18} {best * 1000:9.2f} ms   {baseline / best:6.1f}x")
+
+
+def main():
+    rng = random.Random(280)
+
+    run_case("One 15-week term", [make_course(1, date(2026, 1, 5), 105, rng)], repeat=50)
+    run_case("Multi-year (10 years)", [make_course(i, date(2020, 1, 1), 3650, rng) for i in range(20)])
+    run_case("Many courses (5000 terms)",
+             [make_course(i, date(2026, 1, 5) + timedelta(days=rng.randint(0, 300)), 105, rng)
+              for i in range(5000)])
+
+
+if __name__ == "__main__":
+    main()
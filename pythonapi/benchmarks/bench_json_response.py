@@ -0,0 +1,128 @@
+"""
+Benchmark for JSON response rendering of the event feed.
+
+Compares the default FastAPI path for an endpoint returning a list of dicts (jsonable_encoder
+followed by JSONResponse and the stdlib json module) with FastJSONResponse (orjson, no jsonable_encoder),
+on feeds the size /api/all returns. Then compares building and encoding class meetings one dict at a time
+with splicing them into a per-course CourseEventTemplate.
+
+Run from the pythonapi directory:
+    python benchmarks/bench_json_response.py
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.fast_json import FastJSONResponse
+from services.fast_json import dumps_json
+from services.signed_downloads import signed_download_url
+from utilities.expand_course import format_course_event, CourseEventTemplate
+
+
+COURSE = SimpleNamespace(
+    id=1, courseName="CWEB280 Internet Programming", credits=3, daysOfWeek="M,W",
+    startTime=time(8, 0), endTime=time(10, 0), startDate=date(2026, 1, 5), endDate=date(2026, 4, 17),
+    filename=None, file_path=None, file_hash=None, content_type=None
+)
+
+
+def make_meetings(events):
+    first = datetime(2026, 1, 5, 8, 0)
+    return [(first + timedelta(days=i), first + timedelta(days=i, hours=2)) for i in range(events)]
+
+
+def make_feed(events):
+    """A feed of class meetings as format_course_event builds them"""
+    return [format_course_event(COURSE, start, end) for start, end in make_meetings(events)]
+
+
+def run_case(events, repeat=5):
+    feed = make_feed(events)
+
+    cases = {
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(jsonable_encoder(feed)).body,
+        "stdlib json.dumps (compact)": lambda: json.dumps(feed, ensure_ascii=False, separators=(",", ":")).encode(),
+        "FastJSONResponse (orjson)": lambda: FastJSONResponse(feed).body,
+    }
+
+    assert json.loads(cases["FastJSONResponse (orjson)"]()) == json.loads(cases["jsonable_encoder + JSONResponse"]())
+
+    print(f"\n{events} events ({len(FastJSONResponse(feed).body) // 1024} KiB)")
+    baseline = None
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:<32} {best * 1000:9.2f} ms   {baseline / best:6.1f}x")
+
+
+def original_format_course_event(course, start, end):
+    """The original format_course_event: every field rebuilt for every meeting"""
+    return {
+        "id": course.id,
+        "title": course.courseName,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "allDay": False,
+        "type": "course",
+        "courseId": course.id,
+        "credits": course.credits,
+        "daysOfWeek": course.daysOfWeek,
+        "startTime": course.startTime.isoformat() if course.startTime else None,
+        "endTime": course.endTime.isoformat() if course.endTime else None,
+        "startDate": course.startDate.isoformat() if course.startDate else None,
+        "endDate": course.endDate.isoformat() if course.endDate else None,
+        "filename": course.filename,
+        "has_file": course.file_path is not None,
+        "file_url": signed_download_url(course.file_hash, course.content_type, course.filename)
+    }
+
+
+def run_template_case(events, repeat=5):
+    meetings = make_meetings(events)
+
+    def per_event_dicts():
+        return b",".join(dumps_json(original_format_course_event(COURSE, start, end)) for start, end in meetings)
+
+    def template_dicts():
+        template = CourseEventTemplate(COURSE)
+        return b",".join(dumps_json(template.event(start, end)) for start, end in meetings)
+
+    def template_bytes():
+        template = CourseEventTemplate(COURSE)
+        return b",".join(template.encode(start, end) for start, end in meetings)
+
+    cases = {
+        "dict per meeting + orjson": per_event_dicts,
+        "template.event + orjson": template_dicts,
+        "template.encode (bytes)": template_bytes,
+    }
+
+    assert template_bytes() == per_event_dicts()
+
+    print(f"\nBuild + encode {events} class meetings of one course")
+    baseline = None
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:<32} {best * 1000:9.2f} ms   {baseline / best:6.1f}x")
+
+
+def main():
+    run_case(100, repeat=200)
+    run_case(5000, repeat=20)
+    run_case(50000)
+
+    run_template_case(30, repeat=500)
+    run_template_case(50000)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from services.config import SQL_CONNECTION_STRING
@@ -10,5 +10,17 @@ engine = create_engine(SQL_CONNECTION_STRING, echo=False)
 # Create session
 Session = sessionmaker(bind=engine, expire_on_commit=False)
 
+
+@event.listens_for(engine, "connect")
+def use_write_ahead_log(dbapi_connection, connection_record):
+    """
+    WAL journal: readers don't block the writer and the writer doesn't block them, so requests running
+    side by side in the threadpool don't queue on the file lock.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
 # Create base class for declarative models
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
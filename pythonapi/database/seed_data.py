@@ -6,6 +6,7 @@ from schemas.exam_model import Exam
 from schemas.student_course_model import StudentCourse
 from schemas.student_model import Student
 from schemas.user_model import User
+from utilities.course_occurrences import sync_course_occurrences
 
 
 def init_seed_data():
@@ -54,6 +55,9 @@ def init_seed_data():
         )
         session.add(cosc286)
 
+        # Store the class meetings for both courses
+        sync_course_occurrences(cweb280)
+        sync_course_occurrences(cosc286)
 
         session.commit()
         session.refresh(cweb280)
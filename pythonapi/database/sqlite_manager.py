@@ -8,11 +8,12 @@ from database.db import Session
 from schemas.assignment_model import Assignment
 from schemas.course_model import Course
 from services.config import ASSIGNMENT_UPLOAD_DIR, COURSE_UPLOAD_DIR
+from services.data_version import bump_data_version
 from utilities.assignment_validation import validate_assignment_json
 from utilities.course_validation import validate_course_json, check_course_overlap
-from utilities.expand_course import expand_course
+from utilities.course_occurrences import sync_course_occurrences, load_course_events
 from utilities.file_validation import validate_file
-from utilities.format_assignment import format_assignment
+from utilities.format_assignment import load_assignment_events
 
 
 def insert_course(course, file_data=None, filename=None, content_type=None):
@@ -63,8 +64,11 @@ def insert_course(course, file_data=None, filename=None, content_type=None):
             content_type=content_type
         )
 
+        sync_course_occurrences(new_course)
+
         session.add(new_course)
         session.commit()
+        bump_data_version("course", action="create", ids=[new_course.id])
         session.refresh(new_course)
 
         # Return success with course ID
@@ -116,6 +120,7 @@ def insert_assignment(assignment, file_data=None, filename=None, content_type=No
 
         session.add(new_assignment)
         session.commit()
+        bump_data_version("assignment", action="create", ids=[new_assignment.id])
         session.refresh(new_assignment)
 
         # Return success with assignment ID
@@ -128,7 +133,7 @@ def retrieve_latest_course():
         target_course = session.query(Course).order_by(desc(Course.id)).first()
 
         if target_course:
-            course_events.extend(expand_course(target_course))
+            course_events.extend(load_course_events(session, course_id=target_course.id))
 
         return course_events
 
@@ -136,12 +141,9 @@ def retrieve_latest_course():
 def retrieve_latest_assignment():
     """Retrieve the most recent assignment from the database"""
     with Session() as session:
-        target_assignment = session.query(Assignment).order_by(desc(Assignment.id)).first()
-
-        if target_assignment:
-            return [format_assignment(target_assignment)]
+        latest_id = session.query(Assignment.id).order_by(desc(Assignment.id)).limit(1).scalar_subquery()
 
-        return []
+        return load_assignment_events(session, Assignment.id == latest_id)
 
 
 def get_all_courses():
@@ -1,21 +1,23 @@
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from fastapi.responses import FileResponse
-from typing import Optional
+from datetime import datetime, date
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
+from typing import Callable, Optional
+from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, Field, field_validator
-import os
 import json
 
 from database.db import Session
 from schemas.assignment_model import Assignment
 from schemas.course_model import Course
 from middlewares.auth_middleware import require_auth
-from services.config import ASSIGNMENT_UPLOAD_DIR
+from services.data_version import bump_data_version, conditional_get
+from services.response_cache import cache_key, cached_json_response
+from services.signed_downloads import signed_download_url
+from utilities.blob_store import release_blob
+from utilities.file_upload import save_upload, UploadLimitRoute
+from utilities.format_assignment import format_assignment, load_assignment_events
+from utilities.pagination import keyset_paging
 
-router = APIRouter(prefix="/api", tags=["assignments"])
-
-# Ensure upload directory exists
-ASSIGNMENT_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+router = APIRouter(prefix="/api", tags=["assignments"], route_class=UploadLimitRoute)
 
 
 class AssignmentCreateRequest(BaseModel):
@@ -88,50 +90,42 @@ class AssignmentUpdateRequest(BaseModel):
         return v
 
 
-def format_assignment(assignment_obj):
-    """Format an assignment object for front-end use"""
-    # Get course name
-    with Session() as session:
-        course = session.query(Course).filter_by(id=assignment_obj.courseId).first()
-        course_name = course.courseName if course else "Unknown"
-
-    # Create datetime for calendar
-    due_datetime = datetime.combine(assignment_obj.dueDate, assignment_obj.dueTime)
-
-    return {
-        "id": assignment_obj.id,
-        "originalId": assignment_obj.id,
-        "title": assignment_obj.assignmentTitle,
-        "name": assignment_obj.assignmentTitle,
-        "description": assignment_obj.description,
-        "start": due_datetime.isoformat(),
-        "end": due_datetime.isoformat(),
-        "date": assignment_obj.dueDate.isoformat(),
-        "allDay": False,
-        "type": "assignment",
-        "courseId": assignment_obj.courseId,
-        "code": course_name,
-        "color": "#dc3545",
-        "worth": assignment_obj.worth,
-        "hasFile": bool(assignment_obj.file_path)
-    }
+# Columns /api/assignments can be sorted by (all indexed)
+ASSIGNMENT_SORT_COLUMNS = {"id": Assignment.id, "dueDate": Assignment.dueDate}
 
 
 @router.get("/assignments")
-async def get_assignments(user: dict = Depends(require_auth)):
-    """Get all assignments from the database"""
-    assignment_events = []
+def get_assignments(
+        request: Request,
+        courseId: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page: Callable = Depends(keyset_paging(ASSIGNMENT_SORT_COLUMNS, Assignment.id, entity=lambda row: row[0])),
+        user: dict = Depends(require_auth),
+        cache_headers: dict = Depends(conditional_get("assignment", "course", signed_links=True))
+):
+    """Get assignments by courseId and due date window, one keyset page at a time (cached until they change)"""
+    def build():
+        with Session() as session:
+            query = (
+                session.query(Assignment, Course.courseName)
+                .outerjoin(Course, Course.id == Assignment.courseId)
+            )
+            if courseId is not None:
+                query = query.filter(Assignment.courseId == courseId)
+            if start:
+                query = query.filter(Assignment.dueDate >= start)
+            if end:
+                query = query.filter(Assignment.dueDate <= end)
 
-    with Session() as session:
-        assignments = session.query(Assignment).all()
-        for assignment in assignments:
-            assignment_events.append(format_assignment(assignment))
+            rows, headers = page(query)
+            return [format_assignment(assignment, course_name) for assignment, course_name in rows], headers
 
-    return assignment_events
+    return cached_json_response(cache_key(request), ("assignment", "course"), build, cache_headers, signed_links=True)
 
 
 @router.get("/assignments/{assignment_id}")
-async def get_assignment(assignment_id: int, user: dict = Depends(require_auth)):
+def get_assignment(assignment_id: int, user: dict = Depends(require_auth)):
     """Get a single assignment by ID"""
     with Session() as session:
         assignment = session.query(Assignment).filter_by(id=assignment_id).first()
@@ -147,12 +141,13 @@ async def get_assignment(assignment_id: int, user: dict = Depends(require_auth))
             "dueTime": assignment.dueTime.isoformat() if assignment.dueTime else None,
             "worth": assignment.worth,
             "filename": assignment.filename,
-            "hasFile": bool(assignment.file_path)
+            "hasFile": bool(assignment.file_path),
+            "fileUrl": signed_download_url(assignment.file_hash, assignment.content_type, assignment.filename)
         }
 
 
 @router.post("/accept-assignment")
-async def create_assignment(
+def create_assignment(
     assignment_form: str = Form(...),
     file: UploadFile = File(None),
     user: dict = Depends(require_auth)
@@ -185,22 +180,19 @@ async def create_assignment(
 
             # Handle file upload
             if file and file.filename:
-                filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-                file_path = ASSIGNMENT_UPLOAD_DIR / filename
-
-                with open(file_path, "wb") as buffer:
-                    content = await file.read()
-                    buffer.write(content)
+                stored = save_upload(file)
 
                 new_assignment.filename = file.filename
-                new_assignment.file_path = str(file_path)
+                new_assignment.file_path = stored["path"]
                 new_assignment.content_type = file.content_type
+                new_assignment.file_hash = stored["sha256"]
 
             session.add(new_assignment)
             session.commit()
+            bump_data_version("assignment", action="create", ids=[new_assignment.id])
             session.refresh(new_assignment)
 
-            return [format_assignment(new_assignment)]
+            return load_assignment_events(session, Assignment.id == new_assignment.id)
 
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON in assignment_form")
@@ -209,7 +201,7 @@ async def create_assignment(
 
 
 @router.patch("/assignments/{assignment_id}")
-async def update_assignment(
+def update_assignment(
     assignment_id: int,
     assignment_update: AssignmentUpdateRequest,
     user: dict = Depends(require_auth)
@@ -239,13 +231,14 @@ async def update_assignment(
             assignment.worth = assignment_update.worth
 
         session.commit()
+        bump_data_version("assignment", action="update", ids=[assignment.id])
         session.refresh(assignment)
 
-        return format_assignment(assignment)
+        return load_assignment_events(session, Assignment.id == assignment.id)[0]
 
 
 @router.delete("/assignments/{assignment_id}")
-async def delete_assignment(
+def delete_assignment(
     assignment_id: int,
     user: dict = Depends(require_auth)
 ):
@@ -255,29 +248,27 @@ async def delete_assignment(
         if not assignment:
             raise HTTPException(status_code=404, detail="Assignment not found")
 
-        # Delete associated file if exists
-        if assignment.file_path and os.path.exists(assignment.file_path):
-            os.remove(assignment.file_path)
-
         session.delete(assignment)
         session.commit()
+        bump_data_version("assignment", action="delete", ids=[assignment_id])
+
+        # Delete the file if no other assignment or course shares it
+        release_blob(assignment.file_hash)
 
         return {"message": "Assignment deleted successfully", "id": assignment_id}
 
 
 @router.get("/view-assignment/{assignment_id}")
-async def view_assignment_file(assignment_id: int):
-    """View an assignment's file"""
+def view_assignment_file(assignment_id: int, user: dict = Depends(require_auth)):
+    """Redirects to a signed download URL of an assignment's file (payloads already carry one as fileUrl)"""
     with Session() as session:
-        assignment = session.query(Assignment).filter_by(id=assignment_id).first()
+        assignment = session.get(Assignment, assignment_id)
         if not assignment:
             raise HTTPException(status_code=404, detail="Assignment not found")
 
-        if not assignment.file_path or not os.path.exists(assignment.file_path):
-            raise HTTPException(status_code=404, detail="File not found")
+    if not assignment.file_hash:
+        raise HTTPException(status_code=404, detail="File not found")
 
-        return FileResponse(
-            path=assignment.file_path,
-            media_type=assignment.content_type or 'application/pdf',
-            headers={"Content-Disposition": f"inline; filename=\"{assignment.filename}\""}
-        )
\ No newline at end of file
+    return RedirectResponse(
+        signed_download_url(assignment.file_hash, assignment.content_type, assignment.filename), status_code=307
+    )
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Request
+
+from database.db import Session
+from middlewares.auth_middleware import require_auth, sign_value, verify_signature
+from schemas.assignment_model import Assignment
+from schemas.course_model import Course
+from schemas.exam_model import Exam
+from services.config import CALENDAR_CACHE_TTL_SECONDS
+from services.data_version import conditional_get
+from services.response_cache import cache_key, cached_response
+from utilities.course_occurrences import iter_course_recurrences
+from utilities.enrollments import enrolled_course_ids
+from utilities.format_assignment import iter_assignment_events
+from utilities.format_exam import iter_exam_events
+from utilities.ical import calendar_lines
+
+router = APIRouter(prefix="/api", tags=["calendar"])
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+
+# Tables each feed is built from
+COURSE_FEED_TABLES = ("course", "assignment", "exam")
+USER_FEED_TABLES = COURSE_FEED_TABLES + ("student", "student_course")
+
+
+def render_calendar(calendar_name, course_ids):
+    """
+    Generator of the calendar's lines, written as they are read from the DB.
+    calendar_name(session) returns the name shown in the calendar app.
+    """
+    with Session() as session:
+        course_events = iter_course_recurrences(session, course_ids=course_ids)
+        assignment_events = iter_assignment_events(session, Assignment.courseId.in_(course_ids))
+        exam_events = iter_exam_events(session, Exam.courseId.in_(course_ids))
+
+        yield from calendar_lines(calendar_name(session), course_events, assignment_events, exam_events)
+
+
+def calendar_response(calendar_name, course_ids, key, tables, cache_headers):
+    """Serves a calendar from the response cache, or streams (and caches) a freshly rendered one"""
+    headers = {**cache_headers, "Content-Disposition": "inline; filename=\"calendar.ics\""}
+    return cached_response(key, tables, lambda: render_calendar(calendar_name, course_ids), ICS_MEDIA_TYPE, headers,
+                           CALENDAR_CACHE_TTL_SECONDS)
+
+
+@router.get("/calendar-feed-url")
+async def get_calendar_feed_url(request: Request, courseId: Optional[int] = None, user: dict = Depends(require_auth)):
+    """
+    Signed .ics subscription URL for calendar apps (which can't send a bearer token):
+    the current user's enrolled courses, or a single course if courseId is given.
+    """
+    if courseId is not None:
+        path = f"/api/courses/{courseId}/calendar.ics"
+        signature = sign_value(f"course:{courseId}")
+    else:
+        path = f"/api/calendar/{user['id']}.ics"
+        signature = sign_value(f"user:{user['id']}")
+
+    return {"url": f"{str(request.base_url).rstrip('/')}{path}?sig={signature}"}
+
+
+@router.get("/calendar/{user_id:int}.ics")
+def get_user_calendar(
+        request: Request,
+        user_id: int,
+        sig: Optional[str] = None,
+        cache_headers: dict = Depends(conditional_get(*USER_FEED_TABLES))
+):
+    """iCalendar feed of a user's enrolled courses, assignments and exams (signed URL, see /calendar-feed-url)"""
+    if not verify_signature(f"user:{user_id}", sig):
+        raise HTTPException(status_code=403, detail="Invalid calendar link")
+
+    return calendar_response(lambda session: "My Courses", enrolled_course_ids(user_id), cache_key(request), USER_FEED_TABLES,
+                             cache_headers)
+
+
+@router.get("/courses/{course_id}/calendar.ics")
+def get_course_calendar(
+        request: Request,
+        course_id: int,
+        sig: Optional[str] = None,
+        cache_headers: dict = Depends(conditional_get(*COURSE_FEED_TABLES))
+):
+    """iCalendar feed of one course's classes, assignments and exams (signed URL, see /calendar-feed-url)"""
+    if not verify_signature(f"course:{course_id}", sig):
+        raise HTTPException(status_code=403, detail="Invalid calendar link")
+
+    def calendar_name(session):
+        return session.query(Course.courseName).filter_by(id=course_id).scalar() or "Course"
+
+    return calendar_response(calendar_name, [course_id], cache_key(request), COURSE_FEED_TABLES, cache_headers)
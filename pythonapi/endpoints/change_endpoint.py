@@ -0,0 +1,73 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+
+from middlewares.auth_middleware import require_auth_query
+from services.change_hub import change_hub
+from services.config import CHANGE_STREAM_KEEPALIVE_SECONDS, CHANGE_STREAM_RETRY_MILLISECONDS
+from services.data_version import current_version, version_tag
+
+router = APIRouter(prefix="/api", tags=["changes"])
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def sse_message(event, data, event_id=None):
+    """Formats one server-sent event"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def change_events(request: Request, last_event_id=None):
+    """
+    Async generator for the change stream: a hello with the current data version, then one "change" event per
+    committed write. Event ids are version tags (boot id + version). Changes missed while disconnected can't be
+    replayed, so a client that reconnects with any other id than the current one (behind, or from before a
+    restart, when the version counter started over) is told to resync.
+    """
+    queue = change_hub.subscribe()
+    try:
+        version = current_version()
+        yield f"retry: {CHANGE_STREAM_RETRY_MILLISECONDS}\n\n"
+        yield sse_message("hello", {"version": version}, version_tag(version))
+
+        if last_event_id is not None and last_event_id != version_tag(version):
+            yield sse_message("change", {"version": version, "tables": [], "action": "resync", "ids": []},
+                              version_tag(version))
+
+        while not await request.is_disconnected():
+            try:
+                change = await asyncio.wait_for(queue.get(), timeout=CHANGE_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line, keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+
+            yield sse_message("change", change, version_tag(change["version"]))
+    finally:
+        change_hub.unsubscribe(queue)
+
+
+@router.get("/changes/stream")
+async def stream_changes(
+        request: Request,
+        last_event_id: Optional[str] = Header(None),
+        user: dict = Depends(require_auth_query)
+):
+    """
+    Server-sent events announcing every committed write to courses, assignments, exams, students and enrollments,
+    as {"version", "tables", "action", "ids"}. Clients re-fetch what changed instead of polling.
+    Authenticated with ?token= because EventSource can't send an Authorization header.
+    """
+    return StreamingResponse(
+        change_events(request, last_event_id),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
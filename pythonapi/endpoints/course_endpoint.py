@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Body, HTTPException, File, UploadFile, Form, Depends
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi import APIRouter, Body, HTTPException, File, UploadFile, Form, Depends, Request
+from fastapi.responses import RedirectResponse
+from typing import Callable, Optional
 from pydantic import BaseModel, field_validator, Field
-from datetime import datetime
+from datetime import datetime, date
 import json
-import os
 
 from database.db import Session
 from schemas.course_model import Course
-from utilities.expand_course import expand_course
+from utilities.course_occurrences import sync_course_occurrences, load_course_events
+from utilities.course_validation import check_schedule_conflicts
+from utilities.blob_store import release_blob
+from utilities.file_upload import save_upload, UploadLimitRoute
 from middlewares.auth_middleware import require_auth
-from services.config import COURSE_UPLOAD_DIR
+from services.data_version import bump_data_version, conditional_get
+from services.fast_json import FastJSONResponse
+from services.response_cache import cache_key, cached_json_response
+from services.signed_downloads import signed_download_url
+from utilities.pagination import keyset_paging
 
-router = APIRouter(prefix="/api", tags=["courses"])
-
-# Ensure upload directory exists
-COURSE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+router = APIRouter(prefix="/api", tags=["courses"], route_class=UploadLimitRoute)
 
 
 class CourseCreateRequest(BaseModel):
@@ -111,34 +114,53 @@ class CourseUpdateRequest(BaseModel):
         return v
 
 
-@router.get("/courses")
-async def get_courses(user: dict = Depends(require_auth)):
-    """Get all courses"""
-    course_events = []
+# Columns /api/courses can be sorted by (all indexed)
+COURSE_SORT_COLUMNS = {"id": Course.id, "courseName": Course.courseName, "startDate": Course.startDate}
 
-    with Session() as session:
-        courses = session.query(Course).all()
-        for course in courses:
-            # Return basic course info (not expanded)
-            course_events.append({
-                "id": course.id,
-                "title": course.courseName,
-                "courseName": course.courseName,
-                "credits": course.credits,
-                "startDate": course.startDate.isoformat() if course.startDate else None,
-                "endDate": course.endDate.isoformat() if course.endDate else None,
-                "daysOfWeek": course.daysOfWeek,
-                "startTime": course.startTime.isoformat() if course.startTime else None,
-                "endTime": course.endTime.isoformat() if course.endTime else None,
-                "hasFile": course.filename is not None,
-                "type": "course"
-            })
 
-    return course_events
+@router.get("/courses")
+def get_courses(
+        request: Request,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page: Callable = Depends(keyset_paging(COURSE_SORT_COLUMNS, Course.id)),
+        user: dict = Depends(require_auth),
+        cache_headers: dict = Depends(conditional_get("course", signed_links=True))
+):
+    """Get courses overlapping the start/end window, one keyset page at a time (cached until a course changes)"""
+    def build():
+        with Session() as session:
+            query = session.query(Course)
+            if start:
+                query = query.filter(Course.endDate >= start)
+            if end:
+                query = query.filter(Course.startDate <= end)
+
+            courses, headers = page(query)
+            # Basic course info (not expanded)
+            return [
+                {
+                    "id": course.id,
+                    "title": course.courseName,
+                    "courseName": course.courseName,
+                    "credits": course.credits,
+                    "startDate": course.startDate.isoformat() if course.startDate else None,
+                    "endDate": course.endDate.isoformat() if course.endDate else None,
+                    "daysOfWeek": course.daysOfWeek,
+                    "startTime": course.startTime.isoformat() if course.startTime else None,
+                    "endTime": course.endTime.isoformat() if course.endTime else None,
+                    "hasFile": course.filename is not None,
+                    "fileUrl": signed_download_url(course.file_hash, course.content_type, course.filename),
+                    "type": "course"
+                }
+                for course in courses
+            ], headers
+
+    return cached_json_response(cache_key(request), ("course",), build, cache_headers, signed_links=True)
 
 
 @router.get("/courses/{course_id}")
-async def get_course(course_id: int, user: dict = Depends(require_auth)):
+def get_course(course_id: int, user: dict = Depends(require_auth)):
     """Get a single course by ID"""
     with Session() as session:
         course = session.query(Course).filter_by(id=course_id).first()
@@ -154,12 +176,13 @@ async def get_course(course_id: int, user: dict = Depends(require_auth)):
             "daysOfWeek": course.daysOfWeek,
             "startTime": course.startTime.isoformat() if course.startTime else None,
             "endTime": course.endTime.isoformat() if course.endTime else None,
-            "filename": course.filename
+            "filename": course.filename,
+            "fileUrl": signed_download_url(course.file_hash, course.content_type, course.filename)
         }
 
 
 @router.post("/accept-course")
-async def create_course(
+def create_course(
         course_form: str = Form(None),
         file: UploadFile = File(None),
         user: dict = Depends(require_auth),
@@ -196,6 +219,8 @@ async def create_course(
             if end_time <= start_time:
                 raise HTTPException(status_code=400, detail="End time must be after start time")
 
+            check_schedule_conflicts(session, course_validated.daysOfWeek, start_date, end_date, start_time, end_time)
+
             # Create course
             new_course = Course(
                 courseName=course_validated.courseName,
@@ -209,20 +234,22 @@ async def create_course(
 
             # Handle file upload
             if file and file.filename:
-                file_path = COURSE_UPLOAD_DIR / f"course_{course_validated.courseName}_{file.filename}"
-                with open(file_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
+                stored = save_upload(file)
 
                 new_course.filename = file.filename
-                new_course.file_path = str(file_path)
+                new_course.file_path = stored["path"]
                 new_course.content_type = file.content_type
+                new_course.file_hash = stored["sha256"]
+
+            # Store the class meetings once, instead of expanding the course on every read
+            sync_course_occurrences(new_course)
 
             session.add(new_course)
             session.commit()
+            bump_data_version("course", action="create", ids=[new_course.id])
             session.refresh(new_course)
 
-            return expand_course(new_course)
+            return load_course_events(session, course_id=new_course.id)
 
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON format")
@@ -231,7 +258,7 @@ async def create_course(
 
 
 @router.patch("/courses/{course_id}")
-async def update_course(
+def update_course(
         course_id: int,
         course_form: str = Form(None),
         file: UploadFile = File(None),
@@ -272,21 +299,34 @@ async def update_course(
             if course_update.endTime is not None:
                 course.endTime = datetime.strptime(course_update.endTime, "%H:%M:%S").time()
 
-            # Handle file upload
+            schedule_changed = any(value is not None for value in (
+                course_update.startDate, course_update.endDate, course_update.daysOfWeek,
+                course_update.startTime, course_update.endTime))
+            if schedule_changed:
+                check_schedule_conflicts(session, course.daysOfWeek, course.startDate, course.endDate,
+                                         course.startTime, course.endTime, exclude_id=course.id)
+
+            # Handle file upload (the replaced file is released once the new one is committed)
+            replaced_hash = None
             if file and file.filename:
-                file_path = COURSE_UPLOAD_DIR / f"course_{course.courseName}_{file.filename}"
-                with open(file_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
+                stored = save_upload(file)
+                replaced_hash = course.file_hash
 
                 course.filename = file.filename
-                course.file_path = str(file_path)
+                course.file_path = stored["path"]
                 course.content_type = file.content_type
+                course.file_hash = stored["sha256"]
+
+            # Rebuild the stored class meetings if the schedule changed
+            if schedule_changed:
+                sync_course_occurrences(course)
 
             session.commit()
-            session.refresh(course)
+            bump_data_version("course", action="update", ids=[course.id])
+            if replaced_hash != course.file_hash:
+                release_blob(replaced_hash)
 
-            return expand_course(course)
+            return load_course_events(session, course_id=course.id)
 
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON format")
@@ -295,53 +335,52 @@ async def update_course(
 
 
 @router.delete("/courses/{course_id}")
-async def delete_course(course_id: int, user: dict = Depends(require_auth)):
+def delete_course(course_id: int, user: dict = Depends(require_auth)):
     """Delete a course"""
     with Session() as session:
         course = session.query(Course).filter_by(id=course_id).first()
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
 
-        # Delete associated file if exists
-        if course.file_path and os.path.exists(course.file_path):
-            os.remove(course.file_path)
-
+        # Stored class meetings are deleted with the course (delete-orphan cascade)
         session.delete(course)
         session.commit()
+        bump_data_version("course", action="delete", ids=[course_id])
+
+        # Delete the file if no other course or assignment shares it
+        release_blob(course.file_hash)
 
         return {"message": "Course deleted successfully", "id": course_id}
 
 
 @router.get("/view-course/{course_id}")
-async def view_course_file(course_id: int):
-    """View/download course syllabus file"""
+def view_course_file(course_id: int, user: dict = Depends(require_auth)):
+    """Redirects to a signed download URL of a course's syllabus file (payloads already carry one as fileUrl)"""
     with Session() as session:
-        course = session.query(Course).filter_by(id=course_id).first()
+        course = session.get(Course, course_id)
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
 
-        if not course.file_path or not os.path.exists(course.file_path):
-            raise HTTPException(status_code=404, detail="No file attached to this course")
+    if not course.file_hash:
+        raise HTTPException(status_code=404, detail="No file attached to this course")
 
-        return FileResponse(
-            course.file_path,
-            media_type=course.content_type or "application/pdf",
-            headers={"Content-Disposition": f"inline; filename=\"{course.filename}\""}
-        )
+    return RedirectResponse(signed_download_url(course.file_hash, course.content_type, course.filename),
+                            status_code=307)
 
 
 @router.get("/course-files")
-async def get_course_files(user: dict = Depends(require_auth)):
+def get_course_files(user: dict = Depends(require_auth)):
     """Get list of courses with file info"""
     with Session() as session:
         courses = session.query(Course).all()
-        return [
+        return FastJSONResponse([
             {
                 "id": course.id,
                 "courseName": course.courseName,
                 "has_file": course.filename is not None,
                 "filename": course.filename,
-                "file_path": course.file_path
+                "file_path": course.file_path,
+                "file_url": signed_download_url(course.file_hash, course.content_type, course.filename)
             }
             for course in courses
-        ]
\ No newline at end of file
+        ])
\ No newline at end of file
@@ -1,40 +1,295 @@
-from datetime import datetime
+import heapq
+from datetime import date, timedelta
+from typing import Optional, Literal
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Header, Request, Query
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, or_
 
 from database.db import Session
-from endpoints.assignment_endpoint import format_assignment
-from middlewares.auth_middleware import require_auth
+from middlewares.auth_middleware import require_auth, require_admin
+from services.data_version import conditional_get
+from services.fast_json import FastJSONResponse, dumps_json
+from services.response_cache import cache_key, cached_json_response, response_cache
 
 from schemas.assignment_model import Assignment
 from schemas.course_model import Course
 from schemas.exam_model import Exam
-from utilities.expand_course import expand_course
-from utilities.format_exam import format_exam
+from utilities.change_log import latest_change_id, changes_since
+from utilities.course_occurrences import iter_course_events, iter_course_recurrences
+from utilities.format_assignment import format_assignment, iter_assignment_events
+from utilities.enrollments import enrolled_course_ids
+from utilities.format_exam import format_exam, iter_exam_events
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Tables the event feed is built from
+FEED_TABLES = ("course", "assignment", "exam")
+MY_FEED_TABLES = FEED_TABLES + ("student", "student_course")
+
+# Number of events buffered into each chunk of a streamed response
+STREAM_CHUNK_EVENTS = 200
+
+
+def date_range_filters(column, start=None, end=None):
+    """Builds SQL filters keeping column inside the inclusive start/end date range"""
+    filters = []
+    if start:
+        filters.append(column >= start)
+    if end:
+        filters.append(column <= end)
+    return filters
+
+
+def iter_events(session, start=None, end=None, course_format="expanded", user_id=None, encoded=False):
+    """
+    Yields every event (course meetings, assignments, exams) inside the window, straight off the DB cursors.
+    With course_format="recurrence" each course is yielded once as a recurrence rule instead of once per meeting.
+    With a user_id only events of the courses that user is enrolled in are yielded (joined in SQL).
+    With encoded=True every event is yielded as JSON bytes (class meetings are spliced into a per-course template).
+    """
+    course_ids = enrolled_course_ids(user_id) if user_id is not None else None
+
+    if course_format == "recurrence":
+        courses = iter_course_recurrences(session, start, end, course_ids=course_ids)
+        yield from (map(dumps_json, courses) if encoded else courses)
+    else:
+        #Get the stored class sessions inside the window
+        yield from iter_course_events(session, start, end, course_ids=course_ids, encoded=encoded)
+
+    due_events = iter_due_events(session, start, end, course_ids)
+    yield from (map(dumps_json, due_events) if encoded else due_events)
+
+
+def iter_due_events(session, start=None, end=None, course_ids=None):
+    """Yields the assignments and exams inside the window (of the given courses, if course_ids is given)"""
+    # get assignments due inside the window, joined with their course name in one query
+    assignment_filters = date_range_filters(Assignment.dueDate, start, end)
+    if course_ids is not None:
+        assignment_filters.append(Assignment.courseId.in_(course_ids))
+    yield from iter_assignment_events(session, *assignment_filters)
+
+    #get exams/quizzes inside the window
+    exam_filters = date_range_filters(Exam.dateOf, start, end)
+    if course_ids is not None:
+        exam_filters.append(Exam.courseId.in_(course_ids))
+    yield from iter_exam_events(session, *exam_filters)
+
+
+def stream_events(start=None, end=None, course_format="expanded", user_id=None, ndjson=False):
+    """
+    Generator for StreamingResponse: encodes events as NDJSON lines or as one JSON array.
+    The session lives as long as the stream, and events are sent in small chunks as they are read.
+    Starlette iterates sync generators in its threadpool, so the blocking session doesn't stall the event loop.
+    """
+    with Session() as session:
+        chunk = []
+        first = True
+        if not ndjson:
+            chunk.append(b"[")
+
+        for event in iter_events(session, start, end, course_format, user_id, encoded=True):
+            if ndjson:
+                chunk.append(event + b"\n")
+            else:
+                chunk.append(event if first else b"," + event)
+            first = False
+
+            if len(chunk) >= STREAM_CHUNK_EVENTS:
+                yield b"".join(chunk)
+                chunk = []
+
+        if not ndjson:
+            chunk.append(b"]")
+        if chunk:
+            yield b"".join(chunk)
+
+
+def feed_response(request, start, end, course_format, stream, accept, cache_headers, user_id=None):
+    """Builds the /api/all or /api/my-events response in the format the client asked for"""
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="End date must be on or after start date")
+
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(stream_events(start, end, course_format, user_id, ndjson=True),
+                                 media_type=NDJSON_MEDIA_TYPE, headers=cache_headers)
+
+    if stream:
+        return StreamingResponse(stream_events(start, end, course_format, user_id),
+                                 media_type="application/json", headers=cache_headers)
+
+    def build():
+        with Session() as session:
+            return b"[" + b",".join(iter_events(session, start, end, course_format, user_id, encoded=True)) + b"]"
+
+    if user_id is None:
+        return cached_json_response(cache_key(request), FEED_TABLES, build, cache_headers, signed_links=True)
+    return cached_json_response(cache_key(request, user_id), MY_FEED_TABLES, build, cache_headers,
+                                signed_links=True)
+
+
 @router.get("/all")
-async def get_all_events(user: dict = Depends(require_auth)):
-    """Router for getting all events from the database (assignments, courses, and exams)"""
-    events = []
+def get_all_events(
+        request: Request,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        stream: bool = False,
+        course_format: Literal["expanded", "recurrence"] = Query("expanded", alias="courseFormat"),
+        accept: Optional[str] = Header(None),
+        user: dict = Depends(require_auth),
+        cache_headers: dict = Depends(conditional_get(*FEED_TABLES, signed_links=True))
+):
+    """
+    Router for getting all events from the database (assignments, courses, and exams).
+    Optional start/end dates (YYYY-MM-DD, inclusive) limit the feed to the visible calendar range.
+    courseFormat=recurrence returns each course once with its recurrence rule (daysMask, time and date range,
+    exdates) for the client to expand, instead of one event per class meeting.
+    Send "Accept: application/x-ndjson" to stream one event per line, or stream=true to stream a JSON array.
+    Responses carry an ETag; a matching If-None-Match is answered with 304 before any DB work.
+    """
+    return feed_response(request, start, end, course_format, stream, accept, cache_headers)
+
+
+@router.get("/all/changes")
+def get_event_changes(
+        since: Optional[int] = Query(None, ge=0),
+        course_format: Literal["expanded", "recurrence"] = Query("expanded", alias="courseFormat"),
+        user: dict = Depends(require_auth)
+):
+    """
+    Delta sync for clients that already hold the /api/all feed.
+    Returns the current version of every course, assignment and exam written after the since cursor
+    (a course comes with all of its meetings, and with its assignments since they show the course name)
+    and a tombstone for every one deleted. Replace everything held for a returned (type, id) and drop the
+    tombstoned ones, then pass the returned cursor next time.
+    Without since, only the current cursor is returned: take it before the first full fetch.
+    """
     with Session() as session:
-        #Get all courses and expand them into individual class sessions
-        courses = session.query(Course).all()
-        for course in courses:
-            events.extend(expand_course(course))
+        cursor = latest_change_id(session)
+        if since is None:
+            return FastJSONResponse({"cursor": cursor, "events": [], "deleted": []})
+        if since > cursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        changes = changes_since(session, since, cursor, *FEED_TABLES)
+
+        deleted = []
+        changed_ids = {}
+        for table_name, rows in changes.items():
+            changed_ids[table_name] = [row_id for row_id, action in rows.items() if action != "delete"]
+            deleted += [{"type": table_name, "id": row_id} for row_id, action in rows.items() if action == "delete"]
+
+        events = []
+        if changed_ids["course"]:
+            if course_format == "recurrence":
+                events += iter_course_recurrences(session, course_ids=changed_ids["course"])
+            else:
+                events += iter_course_events(session, course_ids=changed_ids["course"])
+        if changed_ids["assignment"] or changed_ids["course"]:
+            events += iter_assignment_events(session, or_(Assignment.id.in_(changed_ids["assignment"]),
+                                                          Assignment.courseId.in_(changed_ids["course"])))
+        if changed_ids["exam"]:
+            events += iter_exam_events(session, Exam.id.in_(changed_ids["exam"]))
+
+        return FastJSONResponse({"cursor": cursor, "events": events, "deleted": deleted})
+
+
+@router.get("/my-events")
+def get_my_events(
+        request: Request,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        stream: bool = False,
+        course_format: Literal["expanded", "recurrence"] = Query("expanded", alias="courseFormat"),
+        accept: Optional[str] = Header(None),
+        user: dict = Depends(require_auth),
+        cache_headers: dict = Depends(conditional_get(*MY_FEED_TABLES, signed_links=True))
+):
+    """
+    Same as /api/all, but only the events of the courses the current user is enrolled in.
+    Users without a student record get an empty feed.
+    """
+    return feed_response(request, start, end, course_format, stream, accept, cache_headers, user_id=user["id"])
+
+
+def agenda_bucket(column, today):
+    """SQL expression putting a due date in the overdue/dueToday/upcoming bucket of the agenda"""
+    return case(
+        (column < today, "overdue"),
+        (column == today, "dueToday"),
+        else_="upcoming"
+    ).label("bucket")
+
+
+def iter_agenda_items(session, user_id, first_day, last_day, today):
+    """
+    Yields (bucket, event) for the user's assignments and exams due between first_day and last_day (no upper bound
+    if last_day is None), by due time. Each table is read with one range scan of its (courseId, date) index
+    and the two are merged.
+    """
+    course_ids = enrolled_course_ids(user_id)
+
+    assignments = (
+        session.query(Assignment, Course.courseName, agenda_bucket(Assignment.dueDate, today))
+        .outerjoin(Course, Course.id == Assignment.courseId)
+        .filter(Assignment.courseId.in_(course_ids), Assignment.dueDate >= first_day)
+    )
+    exams = (
+        session.query(Exam, Course.courseName, agenda_bucket(Exam.dateOf, today))
+        .outerjoin(Course, Course.id == Exam.courseId)
+        .filter(Exam.courseId.in_(course_ids), Exam.dateOf >= first_day)
+    )
+    if last_day:
+        assignments = assignments.filter(Assignment.dueDate <= last_day)
+        exams = exams.filter(Exam.dateOf <= last_day)
+
+    assignments = assignments.order_by(Assignment.dueDate, Assignment.dueTime, Assignment.id)
+    exams = exams.order_by(Exam.dateOf, Exam.id)
+
+    assignment_items = (
+        (bucket, format_assignment(assignment, course_name)) for assignment, course_name, bucket in assignments
+    )
+    # exams carry the course code too, so agenda cards don't need the course list
+    exam_items = (
+        (bucket, {**format_exam(exam), "code": course_name if course_name else "Unknown"})
+        for exam, course_name, bucket in exams
+    )
+
+    yield from heapq.merge(assignment_items, exam_items, key=lambda item: item[1]["start"])
+
 
-        # get all assignments
-        assignments = session.query(Assignment).all()
-        for assignment in assignments:
-            events.append(format_assignment(assignment))
+@router.get("/upcoming")
+def get_upcoming(
+        request: Request,
+        horizon: Optional[int] = Query(None, ge=0, le=366),
+        overdue_days: int = Query(7, ge=0, le=366, alias="overdueDays"),
+        user: dict = Depends(require_auth)
+):
+    """
+    Agenda of the current user's assignments and exams, bucketed by due date in SQL:
+    overdue (due in the last overdueDays days), dueToday, and upcoming (due in the next horizon days,
+    or any time from tomorrow on without a horizon).
+    Only the courses the user is enrolled in are included.
+    """
+    today = date.today()
 
-        #get all exams/quizzes
-        exams = session.query(Exam).all()
-        for exam in exams:
-            events.append(format_exam(exam))
+    def build():
+        agenda = {"date": today.isoformat(), "overdue": [], "dueToday": [], "upcoming": []}
+        last_day = today + timedelta(days=horizon) if horizon is not None else None
+        with Session() as session:
+            for bucket, event in iter_agenda_items(session, user["id"], today - timedelta(days=overdue_days),
+                                                   last_day, today):
+                agenda[bucket].append(event)
+        return agenda
 
+    # The buckets move at midnight, so the date is part of the key
+    return cached_json_response(cache_key(request, user["id"], today), MY_FEED_TABLES, build, signed_links=True)
 
 
-    return events
\ No newline at end of file
+@router.get("/cache-stats")
+async def get_cache_stats(user: dict = Depends(require_admin)):
+    """Hit/miss counters of the in-process response cache (admin only)"""
+    return response_cache.stats()
@@ -1,13 +1,16 @@
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from datetime import datetime, date
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import Callable, Optional
 from pydantic import BaseModel, Field, field_validator
 
 from database.db import Session
 from schemas.exam_model import Exam
 from schemas.course_model import Course
 from utilities.format_exam import format_exam
+from utilities.pagination import keyset_paging
 from middlewares.auth_middleware import require_auth
+from services.data_version import bump_data_version, conditional_get
+from services.response_cache import cache_key, cached_json_response
 
 router = APIRouter(prefix="/api", tags=["exams"])
 
@@ -60,21 +63,39 @@ class ExamUpdateRequest(BaseModel):
         return v
 
 
+# Columns /api/exams can be sorted by (all indexed)
+EXAM_SORT_COLUMNS = {"id": Exam.id, "dateOf": Exam.dateOf}
+
+
 @router.get("/exams")
-async def get_exams(user: dict = Depends(require_auth)):
-    """Get all exams from the database"""
-    exam_events = []
+def get_exams(
+        request: Request,
+        courseId: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page: Callable = Depends(keyset_paging(EXAM_SORT_COLUMNS, Exam.id)),
+        user: dict = Depends(require_auth),
+        cache_headers: dict = Depends(conditional_get("exam"))
+):
+    """Get exams by courseId and date window, one keyset page at a time (cached until an exam changes)"""
+    def build():
+        with Session() as session:
+            query = session.query(Exam)
+            if courseId is not None:
+                query = query.filter(Exam.courseId == courseId)
+            if start:
+                query = query.filter(Exam.dateOf >= start)
+            if end:
+                query = query.filter(Exam.dateOf <= end)
 
-    with Session() as session:
-        exams = session.query(Exam).all()
-        for exam in exams:
-            exam_events.append(format_exam(exam))
+            exams, headers = page(query)
+            return [format_exam(exam) for exam in exams], headers
 
-    return exam_events
+    return cached_json_response(cache_key(request), ("exam",), build, cache_headers)
 
 
 @router.get("/exams/{exam_id}")
-async def get_exam(exam_id: int, user: dict = Depends(require_auth)):
+def get_exam(exam_id: int, user: dict = Depends(require_auth)):
     """Get a single exam by ID"""
     with Session() as session:
         exam = session.query(Exam).filter_by(id=exam_id).first()
@@ -91,7 +112,7 @@ async def get_exam(exam_id: int, user: dict = Depends(require_auth)):
 
 
 @router.post("/exams")
-async def create_exam(
+def create_exam(
         exam_data: ExamCreateRequest,
         user: dict = Depends(require_auth)
 ):
@@ -115,13 +136,14 @@ async def create_exam(
 
         session.add(new_exam)
         session.commit()
+        bump_data_version("exam", action="create", ids=[new_exam.id])
         session.refresh(new_exam)
 
         return format_exam(new_exam)
 
 
 @router.patch("/exams/{exam_id}")
-async def update_exam(
+def update_exam(
         exam_id: int,
         exam_update: ExamUpdateRequest,
         user: dict = Depends(require_auth)
@@ -147,13 +169,14 @@ async def update_exam(
             exam.courseId = exam_update.courseId
 
         session.commit()
+        bump_data_version("exam", action="update", ids=[exam.id])
         session.refresh(exam)
 
         return format_exam(exam)
 
 
 @router.delete("/exams/{exam_id}")
-async def delete_exam(
+def delete_exam(
         exam_id: int,
         user: dict = Depends(require_auth)
 ):
@@ -165,5 +188,6 @@ async def delete_exam(
 
         session.delete(exam)
         session.commit()
+        bump_data_version("exam", action="delete", ids=[exam_id])
 
         return {"message": "Exam deleted successfully", "id": exam_id}
\ No newline at end of file
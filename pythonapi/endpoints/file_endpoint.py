@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+
+from services.signed_downloads import SHA256_PATTERN, verify_download
+from utilities.blob_store import blob_path
+from utilities.file_download import stored_file_response
+
+router = APIRouter(prefix="/api", tags=["files"])
+
+
+@router.get("/files/{sha256}")
+def download_file(
+        request: Request,
+        sha256: str = Path(..., pattern=SHA256_PATTERN),
+        content_type: Optional[str] = Query(None, alias="type"),
+        name: Optional[str] = None,
+        expires: Optional[int] = None,
+        sig: Optional[str] = None
+):
+    """
+    Serves a stored file from a signed URL (see services.signed_downloads).
+    Only the signature is checked, there is no DB lookup; the content never changes, so it may be cached for good.
+    """
+    if not verify_download(sha256, content_type, name, expires, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired download link")
+
+    return stored_file_response(request, blob_path(sha256), sha256, content_type, name)
@@ -0,0 +1,247 @@
+import heapq
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+
+from database.db import Session
+from endpoints.assignment_endpoint import AssignmentCreateRequest
+from endpoints.course_endpoint import CourseCreateRequest
+from endpoints.exam_endpoint import ExamCreateRequest
+from middlewares.auth_middleware import require_auth
+from schemas.assignment_model import Assignment
+from schemas.course_model import Course
+from schemas.course_occurrence_model import CourseOccurrence
+from schemas.exam_model import Exam
+from services.data_version import bump_data_version
+from services.schedule_index import CourseScheduleIndex
+from utilities.bulk_import import read_import_rows, validate_rows, add_error, import_failed, existing_ids
+from utilities.days_of_week import days_to_mask
+from utilities.expand_course import batch_course_dates
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+
+def find_batch_conflicts(rows, existing):
+    """
+    Schedule conflicts of a batch of new courses, against the existing courses and each other, in one sweep.
+    rows are (row number, (days mask, start date, end date, start time, end time)); existing are Course rows.
+    Schedules are visited by start date and the interval index only holds the ones still running on that date,
+    so each lookup is a bisect plus a few entries. A clash between two rows is reported on the later one.
+    Returns {row number: [labels of the courses and rows it conflicts with]}.
+    """
+    starts = [
+        (course.startDate, 0, ("course", course.id), f"'{course.courseName}'",
+         (course.daysMask, course.startDate, course.endDate, course.startTime, course.endTime))
+        for course in existing
+    ]
+    starts += [(schedule[1], 1, ("row", row_number), f"row {row_number}", schedule) for row_number, schedule in rows]
+    starts.sort()
+
+    index = CourseScheduleIndex()
+    running = []    # heap of (end date, key) of the schedules in the index
+    conflicts = {}
+    for start_date, _, key, label, schedule in starts:
+        while running and running[0][0] < start_date:
+            index.remove(heapq.heappop(running)[1])
+
+        clashes = index.conflicts(*schedule)
+        if key[0] == "row" and clashes:
+            conflicts[key[1]] = [other_label for _, other_label in clashes]
+            continue
+        # An existing course that starts after a row it clashes with is reported on that row
+        for other_key, _ in clashes:
+            if other_key[0] == "row":
+                conflicts.setdefault(other_key[1], []).append(label)
+                index.remove(other_key)
+
+        index.add(key, label, *schedule)
+        heapq.heappush(running, (schedule[2], key))
+
+    return conflicts
+
+
+@router.post("/courses")
+async def import_courses(request: Request, user: dict = Depends(require_auth)):
+    """
+    Creates many courses at once from a JSON array or a CSV upload (columns as in /accept-course).
+    Every row is validated, and checked for name clashes and schedule conflicts against the database and the
+    rest of the batch; if any row fails nothing is imported and the errors are returned per row.
+    Otherwise all courses and their class meetings are inserted in one transaction.
+    """
+    rows = await read_import_rows(request)
+    # Validation and the bulk insert are blocking work, so they run in the threadpool, off the event loop
+    return await run_in_threadpool(create_courses, rows)
+
+
+def create_courses(rows):
+    """Validates the rows of a course import and inserts them (see import_courses)"""
+    valid, errors = validate_rows(rows, CourseCreateRequest)
+
+    schedules = []
+    for row_number, course in valid:
+        start_date = datetime.strptime(course.startDate, "%Y-%m-%d").date()
+        end_date = datetime.strptime(course.endDate, "%Y-%m-%d").date()
+        start_time = datetime.strptime(course.startTime, "%H:%M:%S").time()
+        end_time = datetime.strptime(course.endTime, "%H:%M:%S").time()
+        if end_date <= start_date:
+            add_error(errors, row_number, "End date must be after start date")
+        elif end_time <= start_time:
+            add_error(errors, row_number, "End time must be after start time")
+        else:
+            schedules.append((row_number, course,
+                              (days_to_mask(course.daysOfWeek), start_date, end_date, start_time, end_time)))
+
+    with Session() as session:
+        names = [course.courseName for _, course in valid]
+        taken_names = existing_ids(session, Course.courseName, names)
+        seen_names = {}
+        for row_number, course in valid:
+            if course.courseName in taken_names:
+                add_error(errors, row_number, "Course with this name already exists")
+            elif course.courseName in seen_names:
+                add_error(errors, row_number, f"Same course name as row {seen_names[course.courseName]}")
+            else:
+                seen_names[course.courseName] = row_number
+
+        candidates = []
+        if schedules:
+            # One query for every existing course that could clash with any row of the batch
+            batch_mask = 0
+            for _, _, schedule in schedules:
+                batch_mask |= schedule[0]
+            candidates = session.query(Course).filter(
+                Course.daysMask.op("&")(batch_mask) != 0,
+                Course.startDate <= max(schedule[2] for _, _, schedule in schedules),
+                Course.endDate >= min(schedule[1] for _, _, schedule in schedules)
+            ).all()
+
+        rows = [(row_number, schedule) for row_number, _, schedule in schedules]
+        for row_number, clashes in find_batch_conflicts(rows, candidates).items():
+            add_error(errors, row_number, f"This course conflicts with {', '.join(clashes)}")
+
+        if errors:
+            raise import_failed(errors)
+
+        new_courses = [
+            Course(
+                courseName=course.courseName,
+                credits=course.credits,
+                startDate=schedule[1],
+                endDate=schedule[2],
+                daysOfWeek=course.daysOfWeek,
+                startTime=schedule[3],
+                endTime=schedule[4]
+            )
+            for _, course, schedule in schedules
+        ]
+
+        session.add_all(new_courses)
+        session.flush()
+
+        # Class meetings of the whole batch are computed in one vectorized pass and inserted in one executemany
+        meetings = [
+            {"courseId": new_course.id, "date": day, "start": datetime.combine(day, new_course.startTime),
+             "end": datetime.combine(day, new_course.endTime)}
+            for new_course, dates in zip(new_courses, batch_course_dates(new_courses))
+            for day in dates
+        ]
+        if meetings:
+            session.execute(insert(CourseOccurrence.__table__), meetings)
+        session.commit()
+
+        ids = [new_course.id for new_course in new_courses]
+        bump_data_version("course", action="create", ids=ids)
+        return {"imported": len(ids), "ids": ids}
+
+
+@router.post("/assignments")
+async def import_assignments(request: Request, user: dict = Depends(require_auth)):
+    """
+    Creates many assignments at once from a JSON array or a CSV upload (columns as in /accept-assignment,
+    without files). All-or-nothing, with per-row errors, like /import/courses.
+    """
+    rows = await read_import_rows(request)
+    return await run_in_threadpool(create_assignments, rows)
+
+
+def create_assignments(rows):
+    """Validates the rows of an assignment import and inserts them (see import_assignments)"""
+    valid, errors = validate_rows(rows, AssignmentCreateRequest)
+
+    with Session() as session:
+        known_courses = existing_ids(session, Course.id, [assignment.courseId for _, assignment in valid])
+        taken_titles = existing_ids(session, Assignment.assignmentTitle, [assignment.title for _, assignment in valid])
+
+        seen_titles = {}
+        for row_number, assignment in valid:
+            if assignment.courseId not in known_courses:
+                add_error(errors, row_number, "Course not found")
+            if assignment.title in taken_titles:
+                add_error(errors, row_number, "Assignment with this title already exists")
+            elif assignment.title in seen_titles:
+                add_error(errors, row_number, f"Same assignment title as row {seen_titles[assignment.title]}")
+            else:
+                seen_titles[assignment.title] = row_number
+
+        if errors:
+            raise import_failed(errors)
+
+        new_assignments = [
+            Assignment(
+                assignmentTitle=assignment.title,
+                description=assignment.description,
+                courseId=assignment.courseId,
+                dueDate=datetime.strptime(assignment.dueDate, "%Y-%m-%d").date(),
+                dueTime=datetime.strptime(assignment.dueTime, "%H:%M:%S").time(),
+                worth=assignment.worth
+            )
+            for _, assignment in valid
+        ]
+        session.add_all(new_assignments)
+        session.commit()
+
+        ids = [new_assignment.id for new_assignment in new_assignments]
+        bump_data_version("assignment", action="create", ids=ids)
+        return {"imported": len(ids), "ids": ids}
+
+
+@router.post("/exams")
+async def import_exams(request: Request, user: dict = Depends(require_auth)):
+    """
+    Creates many exams at once from a JSON array or a CSV upload (columns as in POST /exams).
+    All-or-nothing, with per-row errors, like /import/courses.
+    """
+    rows = await read_import_rows(request)
+    return await run_in_threadpool(create_exams, rows)
+
+
+def create_exams(rows):
+    """Validates the rows of an exam import and inserts them (see import_exams)"""
+    valid, errors = validate_rows(rows, ExamCreateRequest)
+
+    with Session() as session:
+        known_courses = existing_ids(session, Course.id, [exam.courseId for _, exam in valid])
+        for row_number, exam in valid:
+            if exam.courseId not in known_courses:
+                add_error(errors, row_number, "Course not found")
+
+        if errors:
+            raise import_failed(errors)
+
+        new_exams = [
+            Exam(
+                title=exam.title,
+                dateOf=datetime.strptime(exam.dateOf, "%Y-%m-%d").date(),
+                weight=exam.weight,
+                courseId=exam.courseId
+            )
+            for _, exam in valid
+        ]
+        session.add_all(new_exams)
+        session.commit()
+
+        ids = [new_exam.id for new_exam in new_exams]
+        bump_data_version("exam", action="create", ids=ids)
+        return {"imported": len(ids), "ids": ids}
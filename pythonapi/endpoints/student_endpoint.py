@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Callable, Optional
 
 from database.db import Session
 from schemas.student_model import Student
@@ -8,6 +13,11 @@ from schemas.student_course_model import StudentCourse
 from schemas.user_model import User
 from schemas.course_model import Course
 from middlewares.auth_middleware import require_auth, require_admin
+from utilities.pagination import keyset_paging
+from services.data_version import bump_data_version
+from services.fast_json import FastJSONResponse
+from utilities.bulk_import import read_import_rows, validate_rows, existing_ids
+from utilities.change_log import log_changes
 
 router = APIRouter(prefix="/api", tags=["students"])
 
@@ -42,16 +52,35 @@ class EnrollmentRequest(BaseModel):
     courseId: int = Field(..., gt=0, description="Course ID to enroll in")
 
 
+class BulkEnrollmentRow(BaseModel):
+    studentId: int = Field(..., gt=0, description="Student ID")
+    courseId: int = Field(..., gt=0, description="Course ID to enroll in")
+
+
+# Columns /api/students can be sorted by (all indexed)
+STUDENT_SORT_COLUMNS = {"id": Student.id, "lastName": Student.lastName}
+
+
 @router.get("/students")
-async def get_students(user: dict = Depends(require_auth)):
-    """Get all students"""
+def get_students(
+        courseId: Optional[int] = None,
+        page: Callable = Depends(keyset_paging(STUDENT_SORT_COLUMNS, Student.id)),
+        user: dict = Depends(require_auth)
+):
+    """Get students, optionally only those enrolled in courseId, one keyset page at a time"""
     with Session() as session:
-        students = session.query(Student).all()
-        return [s.to_dictionary() for s in students]
+        query = session.query(Student)
+        if courseId is not None:
+            query = query.filter(Student.id.in_(
+                select(StudentCourse.studentId).where(StudentCourse.courseId == courseId)
+            ))
+
+        students, headers = page(query)
+        return FastJSONResponse([s.to_dictionary() for s in students], headers=headers)
 
 
 @router.get("/students/{student_id}")
-async def get_student(student_id: int, user: dict = Depends(require_auth)):
+def get_student(student_id: int, user: dict = Depends(require_auth)):
     """Get a single student by ID"""
     with Session() as session:
         student = session.query(Student).filter_by(id=student_id).first()
@@ -70,7 +99,7 @@ async def get_student(student_id: int, user: dict = Depends(require_auth)):
 
 
 @router.post("/students")
-async def create_student(
+def create_student(
         request: StudentCreateRequest,
         user: dict = Depends(require_admin)
 ):
@@ -95,13 +124,14 @@ async def create_student(
 
         session.add(new_student)
         session.commit()
+        bump_data_version("student", action="create", ids=[new_student.id])
         session.refresh(new_student)
 
         return new_student.to_dictionary()
 
 
 @router.patch("/students/{student_id}")
-async def update_student(
+def update_student(
         student_id: int,
         update: StudentUpdateRequest,
         user: dict = Depends(require_admin)
@@ -118,13 +148,14 @@ async def update_student(
             student.lastName = update.lastName
 
         session.commit()
+        bump_data_version("student", action="update", ids=[student.id])
         session.refresh(student)
 
         return student.to_dictionary()
 
 
 @router.delete("/students/{student_id}")
-async def delete_student(
+def delete_student(
         student_id: int,
         user: dict = Depends(require_admin)
 ):
@@ -134,19 +165,25 @@ async def delete_student(
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        # Delete enrollments first
-        session.query(StudentCourse).filter_by(studentId=student_id).delete()
+        # Delete enrollments first (one by one, so each shows up in the change log)
+        enrollments = session.query(StudentCourse).filter_by(studentId=student_id).all()
+        for enrollment in enrollments:
+            session.delete(enrollment)
 
         # Delete student
         session.delete(student)
         session.commit()
+        bump_data_version("student", action="delete", ids=[student_id])
+        if enrollments:
+            bump_data_version("student_course", action="delete",
+                              ids=sorted({enrollment.courseId for enrollment in enrollments}))
 
         return {"message": "Student deleted successfully", "id": student_id}
 
 
 
 @router.get("/students/{student_id}/courses")
-async def get_student_courses(student_id: int, user: dict = Depends(require_auth)):
+def get_student_courses(student_id: int, user: dict = Depends(require_auth)):
     """Get all courses a student is enrolled in"""
     with Session() as session:
         student = session.query(Student).filter_by(id=student_id).first()
@@ -168,7 +205,7 @@ async def get_student_courses(student_id: int, user: dict = Depends(require_auth
 
 
 @router.post("/students/{student_id}/enroll")
-async def enroll_student(
+def enroll_student(
         student_id: int,
         request: EnrollmentRequest,
         user: dict = Depends(require_auth)
@@ -201,6 +238,7 @@ async def enroll_student(
 
         session.add(enrollment)
         session.commit()
+        bump_data_version("student_course", action="create", ids=[request.courseId])
 
         return {
             "message": f"Successfully enrolled in {course.courseName}",
@@ -209,8 +247,75 @@ async def enroll_student(
         }
 
 
+@router.post("/enrollments/bulk")
+async def bulk_enroll(request: Request, user: dict = Depends(require_auth)):
+    """
+    Enrolls many students at once from a JSON array of {studentId, courseId} or a CSV roster upload
+    (studentId,courseId columns). Students and courses are checked with one query each, and the enrollments
+    go in with a single INSERT ... ON CONFLICT DO NOTHING, so existing enrollments are skipped instead of failing.
+    Returns a status per row: enrolled, alreadyEnrolled, duplicate (repeats an earlier row), studentNotFound,
+    courseNotFound or invalid.
+    """
+    rows = await read_import_rows(request)
+    return await run_in_threadpool(enroll_rows, rows)
+
+
+def enroll_rows(rows):
+    """Validates the rows of a bulk enrollment and inserts them (see bulk_enroll). Blocking: runs in the threadpool"""
+    valid, errors = validate_rows(rows, BulkEnrollmentRow)
+    results = {row_number: {"row": row_number, "status": "invalid", "errors": messages}
+               for row_number, messages in errors.items()}
+
+    with Session() as session:
+        known_students = existing_ids(session, Student.id, [row.studentId for _, row in valid])
+        known_courses = existing_ids(session, Course.id, [row.courseId for _, row in valid])
+
+        pending = {}
+        for row_number, row in valid:
+            pair = (row.studentId, row.courseId)
+            result = {"row": row_number, "studentId": row.studentId, "courseId": row.courseId}
+            results[row_number] = result
+            if row.studentId not in known_students:
+                result["status"] = "studentNotFound"
+            elif row.courseId not in known_courses:
+                result["status"] = "courseNotFound"
+            elif pair in pending:
+                result["status"] = "duplicate"
+            else:
+                pending[pair] = result
+
+        inserted = []
+        if pending:
+            enrolled_at = datetime.now()
+            statement = (
+                sqlite_insert(StudentCourse)
+                .values([{"studentId": student_id, "courseId": course_id, "enrolledAt": enrolled_at}
+                         for student_id, course_id in pending])
+                .on_conflict_do_nothing(index_elements=["studentId", "courseId"])
+                .returning(StudentCourse.id, StudentCourse.studentId, StudentCourse.courseId)
+            )
+            inserted = session.execute(statement).all()
+
+            for _, student_id, course_id in inserted:
+                pending[(student_id, course_id)]["status"] = "enrolled"
+            for result in pending.values():
+                result.setdefault("status", "alreadyEnrolled")
+
+            log_changes(session, "student_course", "create", [(row_id, course_id) for row_id, _, course_id in inserted])
+            session.commit()
+
+        if inserted:
+            bump_data_version("student_course", action="create",
+                              ids=sorted({course_id for _, _, course_id in inserted}))
+
+        return {
+            "enrolled": len(inserted),
+            "results": [results[row_number] for row_number in sorted(results)]
+        }
+
+
 @router.delete("/students/{student_id}/courses/{course_id}")
-async def unenroll_student(
+def unenroll_student(
         student_id: int,
         course_id: int,
         user: dict = Depends(require_auth)
@@ -227,6 +332,7 @@ async def unenroll_student(
 
         session.delete(enrollment)
         session.commit()
+        bump_data_version("student_course", action="delete", ids=[course_id])
 
         return {
             "message": "Successfully unenrolled from course",
@@ -237,7 +343,7 @@ async def unenroll_student(
 
 
 @router.get("/my-enrollments")
-async def get_my_enrollments(user: dict = Depends(require_auth)):
+def get_my_enrollments(user: dict = Depends(require_auth)):
     """Get current user's enrolled courses"""
     with Session() as session:
         # Find student record for this user
@@ -253,7 +359,7 @@ async def get_my_enrollments(user: dict = Depends(require_auth)):
 
 
 @router.post("/enroll/{course_id}")
-async def enroll_current_user(
+def enroll_current_user(
         course_id: int,
         user: dict = Depends(require_auth)
 ):
@@ -266,7 +372,8 @@ async def enroll_current_user(
 
         # Find or create student record for this user
         student = session.query(Student).filter_by(userId=user['id']).first()
-        if not student:
+        created_student = student is None
+        if created_student:
             # Get user info to create student
             db_user = session.query(User).filter_by(id=user['id']).first()
             if not db_user:
@@ -295,6 +402,9 @@ async def enroll_current_user(
         )
         session.add(enrollment)
         session.commit()
+        if created_student:
+            bump_data_version("student", action="create", ids=[student.id])
+        bump_data_version("student_course", action="create", ids=[course_id])
 
         return {
             "message": f"Successfully enrolled in {course.courseName}",
@@ -303,7 +413,7 @@ async def enroll_current_user(
 
 
 @router.delete("/enroll/{course_id}")
-async def unenroll_current_user(
+def unenroll_current_user(
         course_id: int,
         user: dict = Depends(require_auth)
 ):
@@ -324,6 +434,7 @@ async def unenroll_current_user(
 
         session.delete(enrollment)
         session.commit()
+        bump_data_version("student_course", action="delete", ids=[course_id])
 
         return {
             "message": "Successfully unenrolled from course",
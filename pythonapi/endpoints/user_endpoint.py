@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import urlencode
+from starlette.concurrency import run_in_threadpool
 
 from database.db import Session
 from schemas.user_model import User
@@ -10,6 +11,8 @@ from middlewares.auth_middleware import (
     generate_jwt, decode_jwt, exchange_code_for_token, require_auth, require_admin,
     GOOGLE_CLIENT_ID, GOOGLE_AUTH_URI, GOOGLE_REDIRECT_URI
 )
+from services.fast_json import FastJSONResponse
+from utilities.pagination import keyset_paging
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
@@ -106,7 +109,7 @@ def init_default_users():
 
 
 @router.post("/login")
-async def login(request: LoginRequest):
+def login(request: LoginRequest):
     """Login with email and password."""
     with Session() as session:
         user = session.query(User).filter_by(email=request.email).first()
@@ -133,7 +136,7 @@ async def login(request: LoginRequest):
 
 
 @router.post("/register")
-async def register(request: RegisterRequest):
+def register(request: RegisterRequest):
     """Register a new user with email and password."""
     with Session() as session:
         existing_user = session.query(User).filter_by(email=request.email).first()
@@ -217,7 +220,7 @@ async def google_callback(credential: str = None, code: str = None):
         print(f"Google user profile: {google_user_profile.get('email')}")
 
         # Inside googleUserProfile there is an email property - use that to find the user in our store
-        user_info = find_user_by_user_info(google_user_profile)
+        user_info = await run_in_threadpool(find_user_by_user_info, google_user_profile)
 
         # reject user if not found in our store
         if not user_info:
@@ -237,7 +240,7 @@ async def google_callback(credential: str = None, code: str = None):
 
 
 @router.post("/google")
-async def google_auth_post(request: dict):
+def google_auth_post(request: dict):
     """
     Google OAuth via POST
     """
@@ -300,16 +303,29 @@ async def verify_token(user: dict = Depends(require_auth)):
     }
 
 
+# Columns /api/auth/users can be sorted by (all indexed)
+USER_SORT_COLUMNS = {"id": User.id, "email": User.email}
+
+
 # User Management Endpoints (Admin only)
 @router.get("/users")
-async def get_all_users(admin: dict = Depends(require_admin)):
+def get_all_users(
+        role: Optional[str] = None,
+        page: Callable = Depends(keyset_paging(USER_SORT_COLUMNS, User.id)),
+        admin: dict = Depends(require_admin)
+):
+    """Get users (admin only), optionally filtered by role, one keyset page at a time"""
     with Session() as session:
-        users = session.query(User).all()
-        return [user.to_dictionary() for user in users]
+        query = session.query(User)
+        if role:
+            query = query.filter(User.role == role)
+
+        users, headers = page(query)
+        return FastJSONResponse([user.to_dictionary() for user in users], headers=headers)
 
 
 @router.get("/users/{user_id}")
-async def get_user(user_id: int, admin: dict = Depends(require_admin)):
+def get_user(user_id: int, admin: dict = Depends(require_admin)):
     with Session() as session:
         user = session.query(User).filter_by(id=user_id).first()
         if not user:
@@ -318,7 +334,7 @@ async def get_user(user_id: int, admin: dict = Depends(require_admin)):
 
 
 @router.patch("/users/{user_id}")
-async def update_user(
+def update_user(
         user_id: int,
         request: UserUpdateRequest,
         current_user: dict = Depends(require_auth)
@@ -352,7 +368,7 @@ async def update_user(
 
 
 @router.delete("/users/{user_id}")
-async def delete_user(
+def delete_user(
         user_id: int,
         current_user: dict = Depends(require_auth)
 ):
@@ -1,7 +1,10 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 
 from database.db import Base
 from services.config import SQL_CONNECTION_STRING
@@ -10,11 +13,37 @@ from schemas.user_model import User
 from schemas.student_model import Student
 from schemas.student_course_model import StudentCourse
 from schemas.course_model import Course
+from schemas.course_occurrence_model import CourseOccurrence
 from schemas.assignment_model import Assignment
 from schemas.exam_model import Exam
+from schemas.change_log_model import ChangeLog
 
-from endpoints import event_endpoint, course_endpoint, assignment_endpoint, user_endpoint, exam_endpoint, student_endpoint
+from endpoints import event_endpoint, course_endpoint, assignment_endpoint, user_endpoint, exam_endpoint, student_endpoint, calendar_endpoint, change_endpoint, import_endpoint, file_endpoint
 from database.seed_data import init_seed_data
+from utilities.course_occurrences import init_course_occurrences
+from utilities.course_validation import init_course_days_masks
+from utilities.enrollments import remove_duplicate_enrollments
+from utilities.blob_store import init_blob_store, sweep_unreferenced_blobs
+
+
+def add_missing_columns(engine):
+    """create_all doesn't alter existing tables, so add columns that were added to a model after its table was made"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                default = f" DEFAULT {column.server_default.arg}" if column.server_default is not None else ""
+                not_null = " NOT NULL" if not column.nullable and default else ""
+                connection.execute(text(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}{not_null}{default}'
+                ))
+                print(f"Added column {table.name}.{column.name}")
 
 
 def init_database():
@@ -25,17 +54,36 @@ def init_database():
     Base.metadata.create_all(bind=engine)
     print(f"Database created: {SQL_CONNECTION_STRING}")
 
+    # create_all skips tables that already exist, so add any columns and indexes missing from older databases
+    add_missing_columns(engine)
+    remove_duplicate_enrollments(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
     # Initialize default users (admin and test users)
     user_endpoint.init_default_users()
     print("Default users initialized")
     init_seed_data()
+    init_course_occurrences()
+    init_course_days_masks()
+    init_blob_store()
 
 
 # Initialize database before creating the FastAPI app
 init_database()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blobs released inside their grace period are only deleted by this periodic sweep
+    blob_sweep = asyncio.create_task(sweep_unreferenced_blobs())
+    yield
+    blob_sweep.cancel()
+
+
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration
 origins = ["http://localhost:5173", "http://localhost:54742"]
@@ -45,6 +93,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
@@ -59,6 +108,10 @@ app.include_router(course_endpoint.router)
 app.include_router(user_endpoint.router)
 app.include_router(exam_endpoint.router)
 app.include_router(student_endpoint.router)
+app.include_router(calendar_endpoint.router)
+app.include_router(change_endpoint.router)
+app.include_router(import_endpoint.router)
+app.include_router(file_endpoint.router)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import os
 from datetime import datetime, timedelta
 from typing import Optional
@@ -107,6 +109,30 @@ async def require_admin(user: dict = Depends(require_auth)) -> dict:
     return user
 
 
+async def require_auth_query(token: Optional[str] = None) -> dict:
+    """Like require_auth, but reads the token from the ?token= query parameter (EventSource can't send headers)"""
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated - No token provided")
+
+    payload = decode_jwt(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    return payload
+
+
+def sign_value(value: str) -> str:
+    """HMAC-SHA256 signature of value with the server secret (for links that can't carry a bearer token)"""
+    return hmac.new(JWT_SECRET_KEY.encode("utf-8"), value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def verify_signature(value: str, signature: Optional[str]) -> bool:
+    """Checks a signature made by sign_value in constant time"""
+    if not signature:
+        return False
+    return hmac.compare_digest(sign_value(value), signature)
+
+
 def get_token_from_request(request: Request) -> Optional[str]:
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Time, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from database.db import Base
@@ -10,13 +10,20 @@ class Assignment(Base):
     id = Column(Integer, primary_key=True)
     assignmentTitle = Column(String, unique=True, nullable=False)
     description = Column(String(500), nullable=True)
-    courseId = Column(Integer, ForeignKey("course.id"), nullable=False)
-    dueDate = Column(Date, nullable=False)
+    courseId = Column(Integer, ForeignKey("course.id"), nullable=False, index=True)
+    dueDate = Column(Date, nullable=False, index=True)
     dueTime = Column(Time, nullable=False)
     worth = Column(Float, nullable=True)
 
     filename = Column(String(255))
     file_path = Column(String(500))
     content_type = Column(String(100))
+    # SHA-256 of the stored file: its key in the blob store (see utilities.blob_store)
+    file_hash = Column(String(64), index=True)
 
-    course = relationship("Course", back_populates="assignments")
\ No newline at end of file
+    course = relationship("Course", back_populates="assignments")
+
+    __table_args__ = (
+        # per-course due date range scans (upcoming agenda, enrolled feeds)
+        Index("ix_assignment_courseId_dueDate", "courseId", "dueDate"),
+    )
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime
+
+from database.db import Base
+
+
+class ChangeLog(Base):
+    """
+    Append-only log of writes to the calendar tables, one row per inserted/updated/deleted row.
+    Rows are written in the same transaction as the change; the id is the delta sync cursor.
+    """
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    tableName = Column(String, nullable=False)
+    rowId = Column(Integer, nullable=False)
+    action = Column(String, nullable=False)  # "create", "update" or "delete"
+    courseId = Column(Integer)
+    changedAt = Column(DateTime, nullable=False, default=datetime.now)
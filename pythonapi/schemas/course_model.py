@@ -1,8 +1,9 @@
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
-from sqlalchemy import Column, Integer, String, Date, Time
+from sqlalchemy import Column, Integer, String, Date, Time, Index
 
 from database.db import Base
+from utilities.days_of_week import days_to_mask
 
 
 class Course(Base):
@@ -12,19 +13,37 @@ class Course(Base):
     id = Column(Integer, primary_key=True)
     courseName = Column(String, unique=True, nullable=False)
     credits = Column(Integer, nullable=False)
-    startDate = Column(Date, nullable=False)
-    endDate = Column(Date, nullable=False)
+    startDate = Column(Date, nullable=False, index=True)
+    endDate = Column(Date, nullable=False, index=True)
     daysOfWeek = Column(String, nullable=False)
+    # daysOfWeek as a weekday bitmask (see days_to_mask), so SQL can intersect day sets with &
+    daysMask = Column(Integer, nullable=False, default=0, server_default="0")
     startTime = Column(Time, nullable=False)
     endTime = Column(Time, nullable=False)
 
     filename = Column(String(255))
     file_path = Column(String(500))
     content_type = Column(String(100))
+    # SHA-256 of the stored file: its key in the blob store (see utilities.blob_store)
+    file_hash = Column(String(64), index=True)
 
     # relationships
     assignments = relationship("Assignment", back_populates="course")
     exams = relationship("Exam", back_populates="course")
 
+    # materialized class meetings, removed together with the course
+    occurrences = relationship("CourseOccurrence", back_populates="course", cascade="all, delete-orphan")
+
     # many-to-many relationship with students via intermediate table
-    students = relationship("Student", secondary="student_course", back_populates="courses")
\ No newline at end of file
+    students = relationship("Student", secondary="student_course", back_populates="courses")
+
+    __table_args__ = (
+        # schedule conflict lookups (see check_schedule_conflicts)
+        Index("ix_course_startTime_endTime", "startTime", "endTime"),
+    )
+
+    @validates("daysOfWeek")
+    def update_days_mask(self, key, days_of_week):
+        """Keeps daysMask in step with daysOfWeek on every write"""
+        self.daysMask = days_to_mask(days_of_week) if days_of_week else 0
+        return days_of_week
\ No newline at end of file
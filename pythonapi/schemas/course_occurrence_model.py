@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from database.db import Base
+
+
+class CourseOccurrence(Base):
+    """
+    Materialized class meetings of a course (one row per meeting), rebuilt whenever the course schedule is written
+    """
+    __tablename__ = "course_occurrence"
+
+    id = Column(Integer, primary_key=True)
+    courseId = Column(Integer, ForeignKey("course.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    start = Column(DateTime, nullable=False)
+    end = Column(DateTime, nullable=False)
+
+    # Relationship to Course
+    course = relationship("Course", back_populates="occurrences")
+
+    __table_args__ = (
+        Index("ix_course_occurrence_date_courseId", "date", "courseId"),
+    )
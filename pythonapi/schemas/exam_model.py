@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from database.db import Base
@@ -12,9 +12,14 @@ class Exam(Base):
 
     id = Column(Integer, primary_key=True) # examID
     title = Column(String, nullable=False)
-    dateOf = Column(Date, nullable=False)
+    dateOf = Column(Date, nullable=False, index=True)
     weight = Column(Float, nullable=False)
-    courseId = Column(Integer, ForeignKey("course.id"), nullable=False)
+    courseId = Column(Integer, ForeignKey("course.id"), nullable=False, index=True)
 
     # Relationship to Course
-    course = relationship("Course", back_populates="exams")
\ No newline at end of file
+    course = relationship("Course", back_populates="exams")
+
+    __table_args__ = (
+        # per-course date range scans (upcoming agenda, enrolled feeds)
+        Index("ix_exam_courseId_dateOf", "courseId", "dateOf"),
+    )
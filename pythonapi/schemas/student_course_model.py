@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from datetime import datetime
 
 from database.db import Base
@@ -12,9 +12,14 @@ class StudentCourse(Base):
 
     id = Column(Integer, primary_key=True)
     studentId = Column(Integer, ForeignKey("student.id"), nullable=False)
-    courseId = Column(Integer, ForeignKey("course.id"), nullable=False)
+    courseId = Column(Integer, ForeignKey("course.id"), nullable=False, index=True)
     enrolledAt = Column(DateTime, default=datetime.now())
 
+    __table_args__ = (
+        # a student is enrolled in a course at most once (bulk enrollment inserts ON CONFLICT DO NOTHING)
+        Index("ux_student_course_studentId_courseId", "studentId", "courseId", unique=True),
+    )
+
     def to_dictionary(self):
         """Convert to dictionary"""
         return {
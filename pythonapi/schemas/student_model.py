@@ -10,7 +10,7 @@ class Student(Base):
 
     id = Column(Integer, primary_key=True)
     firstName = Column(String(255), nullable=False)
-    lastName = Column(String(255), nullable=False)
+    lastName = Column(String(255), nullable=False, index=True)
     userId = Column(Integer, ForeignKey("user.id"), unique=True, nullable=False)
 
     # Relationship to User (one-to-one)
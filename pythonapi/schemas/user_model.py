@@ -13,7 +13,7 @@ class User(Base):
     lastName = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     password = Column(String(255), nullable=True)  # Nullable for Google users
-    role = Column(String(50), default="user", nullable=False)  # 'admin' or 'user'
+    role = Column(String(50), default="user", nullable=False, index=True)  # 'admin' or 'user'
     is_google_user = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
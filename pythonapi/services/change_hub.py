@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+from services.config import CHANGE_STREAM_QUEUE_SIZE
+from services.data_version import add_bump_listener
+
+
+class ChangeHub:
+    """
+    In-process fan-out of data changes to the open change streams.
+    Every subscriber gets its own bounded queue; a subscriber that falls too far behind
+    has its backlog replaced by a single "resync" message instead of holding memory.
+    """
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Opens a queue that will receive every change published from now on (call from the event loop)"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, change):
+        """Hands a change to every subscriber. Safe to call from any thread (writes run in the threadpool too)"""
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, change)
+            except RuntimeError:
+                # The subscriber's event loop is closed
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue, change):
+        try:
+            queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # Too far behind to catch up change by change: drop the backlog and ask for a full refetch
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"version": change["version"], "tables": [], "action": "resync", "ids": []})
+
+
+change_hub = ChangeHub(CHANGE_STREAM_QUEUE_SIZE)
+
+# Every committed write is pushed to the open change streams
+add_bump_listener(change_hub.publish)
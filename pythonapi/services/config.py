@@ -3,3 +3,37 @@ from pathlib import Path
 SQL_CONNECTION_STRING = "sqlite:///CourseTracker.db"
 ASSIGNMENT_UPLOAD_DIR = Path("./public/assignment_uploads")
 COURSE_UPLOAD_DIR = Path("./public/course_uploads")
+
+# Uploads are streamed to disk this many bytes at a time and rejected once they pass the size limit
+UPLOAD_MAX_BYTES = 25 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Room left for the other form fields and the multipart framing when an upload request is checked by its Content-Length
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+# Uploaded files are stored once per content hash; a blob stored this recently is never garbage collected,
+# since the row of an upload of the same file may not be committed yet
+BLOB_STORE_DIR = Path("./public/blobs")
+BLOB_GRACE_SECONDS = 15 * 60
+# Blobs released while still inside the grace period are collected by a sweep that runs this often
+BLOB_SWEEP_INTERVAL_SECONDS = 5 * 60
+
+# Downloads pinned to a content hash never change, so browsers may keep them this long
+BLOB_CACHE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+
+# Signed download URLs are issued per window of this many seconds and stay valid until the end of the next window.
+# A file's URL only changes when the window does, and a new URL is a browser cache miss (and restarts any
+# ranged download), so the window is long; the cost is that a leaked link keeps working for up to two windows.
+# Payloads that embed these URLs change their ETag with the window, so clients refetch them before their links expire.
+DOWNLOAD_URL_WINDOW_SECONDS = 30 * 24 * 60 * 60
+
+# In-process cache of serialized list/feed responses
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_TTL_SECONDS = 300
+
+# Rendered .ics feeds stay cached until the data changes (or this many seconds pass)
+CALENDAR_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Server-sent change notifications
+CHANGE_STREAM_QUEUE_SIZE = 100
+CHANGE_STREAM_KEEPALIVE_SECONDS = 25
+CHANGE_STREAM_RETRY_MILLISECONDS = 3000
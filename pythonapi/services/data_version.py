@@ -0,0 +1,96 @@
+import threading
+import uuid
+
+from fastapi import HTTPException, Request, Response
+
+from services.signed_downloads import download_url_window
+
+# The counters live in this process (the API runs as a single uvicorn worker).
+# The boot id changes on every start, so ETags handed out by a previous process never match.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+_lock = threading.Lock()
+_version = 0
+_table_versions = {}
+
+# Callbacks run after every bump with a description of the change (response cache invalidation, change push)
+_bump_listeners = []
+
+
+def add_bump_listener(callback):
+    """Registers callback(change) to be called after every data version bump"""
+    _bump_listeners.append(callback)
+
+
+def bump_data_version(*tables, action=None, ids=None):
+    """
+    Call after a write has been committed.
+    Advances the global data version and stamps each written table (e.g. "course") with it.
+    action ("create", "update" or "delete") and ids (ids of the written rows, course ids for enrollment changes)
+    are passed on to the listeners so clients can be told what changed.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        for table in tables:
+            _table_versions[table] = _version
+        version = _version
+
+    change = {"version": version, "tables": list(tables), "action": action, "ids": list(ids or [])}
+    for callback in _bump_listeners:
+        callback(change)
+
+    return version
+
+
+def current_version(*tables):
+    """Latest version stamp of the given tables (of all data if no tables are given)"""
+    if not tables:
+        return _version
+    return max(_table_versions.get(table, 0) for table in tables)
+
+
+def version_tag(version):
+    """Process-unique name of a data version (e.g. a change stream event id): it never matches one from a previous process"""
+    return f"{_BOOT_ID}-{version}"
+
+
+def make_etag(*tables, signed_links=False):
+    """
+    Weak ETag for a response built from the given tables.
+    signed_links is for bodies that embed signed download URLs: their ETag also includes the URL window,
+    so a client never revalidates a body whose file links have expired.
+    """
+    if signed_links:
+        return f'W/"{_BOOT_ID}-{download_url_window()}-{current_version(*tables)}"'
+    return f'W/"{_BOOT_ID}-{current_version(*tables)}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Checks an If-None-Match header against an ETag (weak comparison, as used for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    bare_etag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare_etag for candidate in if_none_match.split(","))
+
+
+def conditional_get(*tables, signed_links=False):
+    """
+    Dependency factory for GET endpoints that only read the given tables (see make_etag for signed_links).
+    Answers 304 Not Modified (before any DB work) when the client already holds the current version,
+    otherwise adds the ETag to the response and returns the cache headers (for endpoints that build their own Response).
+    """
+    def check_etag(request: Request, response: Response) -> dict:
+        etag = make_etag(*tables, signed_links=signed_links)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept, Authorization"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return headers
+
+    return check_etag
@@ -0,0 +1,24 @@
+import orjson
+from fastapi.responses import Response
+
+
+def dumps_json(data):
+    """
+    Serializes prebuilt dicts/lists straight to compact UTF-8 JSON bytes with orjson.
+    date, datetime and time values are written in isoformat natively.
+    """
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for endpoints that return large lists of plain dicts (feeds, list endpoints).
+    Return it from the endpoint (rather than a dict) so FastAPI skips jsonable_encoder;
+    content can also be already serialized bytes (e.g. from the response cache).
+    """
+    media_type = "application/json"
+
+    def render(self, content):
+        if isinstance(content, bytes):
+            return content
+        return dumps_json(content)
@@ -0,0 +1,148 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from services.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from services.data_version import add_bump_listener, current_version
+from services.fast_json import FastJSONResponse, dumps_json
+from services.signed_downloads import download_url_window
+
+
+class ResponseCache:
+    """
+    Bounded, TTL-backed LRU cache of serialized response bodies.
+    Every entry remembers the tables it was built from and their data version, so a write to
+    one table only drops the entries that read it.
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        """Returns the cached value for key if it is still fresh and built from this data version, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["version"] != version or entry["expires"] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["body"]
+
+    def put(self, key, tables, version, body, ttl_seconds=None):
+        """Stores a body (any value) built from the given tables at the given data version"""
+        with self._lock:
+            self._entries[key] = {
+                "tables": frozenset(tables),
+                "version": version,
+                "body": body,
+                "expires": time.monotonic() + (ttl_seconds or self.ttl_seconds)
+            }
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        """Drops every entry built from any of the given tables"""
+        written = set(tables)
+        with self._lock:
+            stale_keys = [key for key, entry in self._entries.items() if entry["tables"] & written]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+
+# Writes invalidate the entries built from the tables they touched
+add_bump_listener(lambda change: response_cache.invalidate(change["tables"]))
+
+
+def cache_key(request: Request, *parts):
+    """Cache key for a request: path, query string and any extra parts (e.g. a user id)"""
+    return (request.url.path, str(request.query_params)) + parts
+
+
+def _stream_and_store(chunks, key, tables, version, ttl_seconds):
+    """Passes a generator's text chunks on as they are rendered, then caches the whole body"""
+    rendered = []
+    for chunk in chunks:
+        rendered.append(chunk)
+        yield chunk
+    response_cache.put(key, tables, version, ("".join(rendered).encode("utf-8"), {}), ttl_seconds)
+
+
+def cached_response(key, tables, build, media_type, headers=None, ttl_seconds=None, signed_links=False):
+    """
+    Returns a Response of media_type for key from the cache, calling build() and storing its output on a miss.
+    tables are the tables build() reads from.
+    build() returns the body as bytes (or a (bytes, extra_headers) tuple for headers that belong to the body,
+    e.g. paging), or a generator of text chunks, which is streamed as it is rendered and cached once complete
+    (it is iterated in the threadpool, so it may hold a blocking session).
+    Set signed_links if the body embeds signed download URLs, so it is rebuilt in every URL window.
+    """
+    # Read the version before building, so a write that lands mid-build makes the entry stale
+    version = current_version(*tables)
+    if signed_links:
+        version = (version, download_url_window())
+    cached = response_cache.get(key, version)
+
+    if cached is None:
+        body = build()
+        if inspect.isgenerator(body):
+            return StreamingResponse(_stream_and_store(body, key, tables, version, ttl_seconds),
+                                     media_type=media_type, headers=headers)
+
+        cached = body if isinstance(body, tuple) else (body, {})
+        response_cache.put(key, tables, version, cached, ttl_seconds)
+
+    body, extra_headers = cached
+    return Response(content=body, media_type=media_type, headers={**(headers or {}), **extra_headers})
+
+
+def cached_json_response(key, tables, build, headers=None, signed_links=False):
+    """
+    cached_response for JSON: build() returns the data (or its JSON bytes), or a (data, extra_headers) tuple.
+    """
+    def build_json():
+        data = build()
+        extra_headers = {}
+        if isinstance(data, tuple):
+            data, extra_headers = data
+        return (data if isinstance(data, bytes) else dumps_json(data)), extra_headers
+
+    return cached_response(key, tables, build_json, FastJSONResponse.media_type, headers, signed_links=signed_links)
@@ -0,0 +1,65 @@
+from bisect import bisect_left, insort
+
+from utilities.days_of_week import mask_to_weekdays
+
+
+def second_of_day(value):
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class CourseScheduleIndex:
+    """
+    In-memory interval index of course meeting times, for checking many schedules against each other at once
+    (a single schedule is checked in SQL, see utilities.course_validation.find_schedule_conflicts).
+    For each weekday, the schedules meeting on it are kept sorted by start time, together with the longest
+    meeting of that day. A meeting from start to end can only overlap entries starting in
+    (start - longest meeting, end), so a lookup is one bisect plus the entries in that window.
+    """
+
+    def __init__(self):
+        self._days = {}       # weekday -> sorted [(start second, end second, key)]
+        self._longest = {}    # weekday -> longest meeting on that day, in seconds
+        self._entries = {}    # key -> (label, days mask, start date, end date, start time, end time)
+
+    def add(self, key, label, days_mask, start_date, end_date, start_time, end_time):
+        """Adds a schedule under key (any sortable value, unique in the index); label is what conflicts() returns"""
+        start, end = second_of_day(start_time), second_of_day(end_time)
+        self._entries[key] = (label, days_mask, start_date, end_date, start_time, end_time)
+        for weekday in mask_to_weekdays(days_mask):
+            insort(self._days.setdefault(weekday, []), (start, end, key))
+            self._longest[weekday] = max(self._longest.get(weekday, 0), end - start)
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, days_mask, _, _, start_time, end_time = entry
+        sort_key = (second_of_day(start_time), second_of_day(end_time), key)
+        for weekday in mask_to_weekdays(days_mask):
+            entries = self._days[weekday]
+            del entries[bisect_left(entries, sort_key)]
+            # _longest is left as an upper bound; it only widens the window that is scanned
+
+    def conflicts(self, days_mask, start_date, end_date, start_time, end_time):
+        """
+        Schedules meeting on a shared weekday, at an overlapping time, within an overlapping date range.
+        Returns [(key, label)] sorted by key.
+        """
+        start, end = second_of_day(start_time), second_of_day(end_time)
+        found = {}
+
+        for weekday in mask_to_weekdays(days_mask):
+            entries = self._days.get(weekday)
+            if not entries:
+                continue
+
+            low = bisect_left(entries, (start - self._longest[weekday] + 1,))
+            high = bisect_left(entries, (end,))
+            for entry_start, entry_end, key in entries[low:high]:
+                if entry_end <= start or key in found:
+                    continue
+                label, _, entry_start_date, entry_end_date, _, _ = self._entries[key]
+                if start_date <= entry_end_date and end_date >= entry_start_date:
+                    found[key] = label
+
+        return sorted(found.items())
@@ -0,0 +1,38 @@
+import time
+from urllib.parse import urlencode
+
+from middlewares.auth_middleware import sign_value, verify_signature
+from services.config import DOWNLOAD_URL_WINDOW_SECONDS
+
+SHA256_PATTERN = "^[0-9a-f]{64}$"
+
+
+def download_url_window():
+    """Number of the current signing window (see DOWNLOAD_URL_WINDOW_SECONDS)"""
+    return int(time.time()) // DOWNLOAD_URL_WINDOW_SECONDS
+
+
+def _download_query(content_type, filename, expires):
+    return urlencode({"type": content_type, "name": filename, "expires": expires})
+
+
+def signed_download_url(sha256, content_type, filename):
+    """
+    Signed /api/files URL of a stored file (None if there is no file). The signature covers the content hash,
+    content type, filename and expiry, so the file can be served without looking its row up.
+    Every URL issued in a window is the same and expires at the end of the next window, so a file keeps one URL
+    (and one browser cache entry) for the whole window, and payloads that embed it stay cacheable.
+    """
+    if not sha256:
+        return None
+
+    expires = (download_url_window() + 2) * DOWNLOAD_URL_WINDOW_SECONDS
+    query = _download_query(content_type or "application/pdf", filename or sha256, expires)
+    return f"/api/files/{sha256}?{query}&sig={sign_value(f'file:{sha256}?{query}')}"
+
+
+def verify_download(sha256, content_type, filename, expires, sig):
+    """Checks the parameters of a URL made by signed_download_url and that it hasn't expired"""
+    if None in (content_type, filename, expires) or expires < time.time():
+        return False
+    return verify_signature(f"file:{sha256}?{_download_query(content_type, filename, expires)}", sig)
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from database.db import Session
+from schemas.assignment_model import Assignment
+from schemas.course_model import Course
+from services.config import BLOB_STORE_DIR, BLOB_GRACE_SECONDS, BLOB_SWEEP_INTERVAL_SECONDS
+
+# Models whose file_hash references a blob; a blob is deleted once none of their rows do
+BLOB_REFERENCES = (Course, Assignment)
+
+# Held while a blob is checked and stored or deleted, so a sweep can't delete a blob an upload just reused
+_blob_lock = threading.Lock()
+
+
+def blob_path(sha256):
+    """Where the blob with this SHA-256 is stored (fanned out over two directory levels)"""
+    return BLOB_STORE_DIR / sha256[:2] / sha256[2:4] / sha256
+
+
+def blob_temp_file():
+    """Opens a temp file inside the store (same filesystem, so store_blob can rename it). Returns (file, path)"""
+    BLOB_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=BLOB_STORE_DIR, prefix=".upload-", suffix=".tmp")
+    return os.fdopen(descriptor, "wb"), temp_path
+
+
+def store_blob(temp_path, sha256):
+    """
+    Moves a fully written temp file into the store under its hash and returns the blob path.
+    If the content is already stored, the temp file is dropped and the existing blob's mtime refreshed,
+    which keeps release_blob from deleting it before the new reference is committed.
+    """
+    path = blob_path(sha256)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _blob_lock:
+        if path.exists():
+            os.remove(temp_path)
+            os.utime(path)
+        else:
+            os.replace(temp_path, path)
+    return path
+
+
+def blob_reference_count(session, sha256):
+    """Number of rows referencing the blob"""
+    return sum(session.query(model).filter(model.file_hash == sha256).count() for model in BLOB_REFERENCES)
+
+
+def remove_if_stale(path, cutoff):
+    """Deletes a stored file unless it was written (or reused by an upload) after cutoff. Returns True if deleted"""
+    with _blob_lock:
+        try:
+            if path.stat().st_mtime > cutoff:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def release_blob(sha256):
+    """
+    Deletes a blob once no row references it. Call after committing the change that dropped a reference
+    (blocking: run it in the threadpool). Blobs stored within the last BLOB_GRACE_SECONDS are kept,
+    and deleted by the next sweep after that (see sweep_unreferenced_blobs).
+    """
+    if sha256 is None:
+        return
+
+    with Session() as session:
+        if blob_reference_count(session, sha256):
+            return
+
+    remove_if_stale(blob_path(sha256), time.time() - BLOB_GRACE_SECONDS)
+
+
+def is_blob(file_path):
+    return Path(file_path).resolve().is_relative_to(BLOB_STORE_DIR.resolve())
+
+
+def add_file_to_store(file_path):
+    """Copies an existing file into the store. Returns (blob path, sha256)"""
+    with open(file_path, "rb") as source:
+        sha256 = hashlib.file_digest(source, "sha256").hexdigest()
+        source.seek(0)
+        temp_file, temp_path = blob_temp_file()
+        with temp_file:
+            shutil.copyfileobj(source, temp_file)
+    return store_blob(temp_path, sha256), sha256
+
+
+def init_blob_store():
+    """
+    Moves files uploaded before the blob store existed into it, so identical ones are kept once,
+    then drops blobs (and abandoned temp files) nothing references any more.
+    """
+    BLOB_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    moved = set()
+
+    with Session() as session:
+        for model in BLOB_REFERENCES:
+            for row in session.query(model).filter(model.file_path.isnot(None)).all():
+                if is_blob(row.file_path) or not os.path.exists(row.file_path):
+                    continue
+                moved.add(row.file_path)
+                path, row.file_hash = add_file_to_store(row.file_path)
+                row.file_path = str(path)
+
+        if moved:
+            session.commit()
+
+    for file_path in moved:
+        os.remove(file_path)
+    if moved:
+        print(f"Moved {len(moved)} uploaded file(s) into the blob store")
+
+    collect_unreferenced_blobs()
+
+
+def collect_unreferenced_blobs():
+    """Deletes blobs no row references and temp files of abandoned uploads, once they are older than the grace period"""
+    with Session() as session:
+        referenced = set()
+        for model in BLOB_REFERENCES:
+            referenced.update(sha256 for sha256, in session.query(model.file_hash).filter(model.file_hash.isnot(None)))
+
+    cutoff = time.time() - BLOB_GRACE_SECONDS
+    removed = 0
+    for path in BLOB_STORE_DIR.rglob("*"):
+        if path.is_file() and path.name not in referenced and remove_if_stale(path, cutoff):
+            removed += 1
+    if removed:
+        print(f"Removed {removed} unreferenced blob(s)")
+
+
+async def sweep_unreferenced_blobs():
+    """Runs collect_unreferenced_blobs (in the threadpool) every BLOB_SWEEP_INTERVAL_SECONDS while the app is up"""
+    while True:
+        await asyncio.sleep(BLOB_SWEEP_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(collect_unreferenced_blobs)
+        except Exception as e:
+            print(f"Blob sweep failed: {e}")
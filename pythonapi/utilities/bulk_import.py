@@ -0,0 +1,86 @@
+import csv
+import io
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+
+# Largest number of rows accepted in one import
+MAX_IMPORT_ROWS = 5000
+
+
+async def read_import_rows(request: Request):
+    """
+    Reads the rows of a bulk import: a JSON array of objects, or a CSV file (with a header row)
+    uploaded as multipart form field "file". Empty CSV cells are treated as missing values.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="A CSV file is required in the 'file' field")
+        try:
+            text = (await upload.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+        rows = [
+            {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON format")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of objects")
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows to import")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_IMPORT_ROWS} rows can be imported at once")
+
+    return rows
+
+
+def validation_messages(error: ValidationError):
+    """Readable messages for a Pydantic validation error, one per invalid field"""
+    messages = []
+    for detail in error.errors():
+        field = ".".join(str(part) for part in detail["loc"])
+        messages.append(f"{field}: {detail['msg']}" if field else detail["msg"])
+    return messages
+
+
+def validate_rows(rows, model):
+    """
+    Validates every row with a Pydantic request model.
+    Returns (valid, errors): valid is a list of (row number, model instance), errors maps row number to messages.
+    Row numbers start at 1 (the first data row of a CSV).
+    """
+    valid = []
+    errors = {}
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            valid.append((row_number, model(**row)))
+        except ValidationError as e:
+            errors[row_number] = validation_messages(e)
+    return valid, errors
+
+
+def existing_ids(session, column, values):
+    """The values of column (e.g. Course.id) that exist, in one query"""
+    return {value for (value,) in session.query(column).filter(column.in_(set(values)))}
+
+
+def add_error(errors, row_number, message):
+    errors.setdefault(row_number, []).append(message)
+
+
+def import_failed(errors):
+    """The error raised when any row is invalid: nothing is imported, every problem is reported by row"""
+    return HTTPException(status_code=400, detail={
+        "message": "No rows were imported",
+        "errors": [{"row": row_number, "errors": messages} for row_number, messages in sorted(errors.items())]
+    })
@@ -0,0 +1,75 @@
+from sqlalchemy import event, func, inspect
+
+from database.db import Session
+from schemas.assignment_model import Assignment
+from schemas.change_log_model import ChangeLog
+from schemas.course_model import Course
+from schemas.exam_model import Exam
+from schemas.student_course_model import StudentCourse
+
+# Models whose writes are recorded in the change log
+TRACKED_MODELS = (Course, Assignment, Exam, StudentCourse)
+
+
+def change_row(obj, action):
+    """Change log row (as a dict for a Core insert) for one written object"""
+    return {
+        "tableName": obj.__tablename__,
+        "rowId": obj.id,
+        "action": action,
+        "courseId": obj.id if isinstance(obj, Course) else obj.courseId
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def record_changes(session, flush_context):
+    """
+    Writes a change log row for every tracked object in the flush, on the flush's own connection,
+    so the log entry commits or rolls back together with the change it describes.
+    Bulk query.delete()/update() calls skip the ORM and are not recorded; load and delete the objects instead.
+    """
+    rows = [change_row(obj, "create") for obj in session.new if isinstance(obj, TRACKED_MODELS)]
+    rows += [
+        change_row(obj, "update") for obj in session.dirty
+        if isinstance(obj, TRACKED_MODELS) and session.is_modified(obj) and not inspect(obj).deleted
+    ]
+    rows += [change_row(obj, "delete") for obj in session.deleted if isinstance(obj, TRACKED_MODELS)]
+
+    if rows:
+        session.connection().execute(ChangeLog.__table__.insert(), rows)
+
+
+def log_changes(session, table_name, action, rows):
+    """
+    Records (row id, course id) pairs written with Core statements (which skip the after_flush hook),
+    in the session's current transaction.
+    """
+    if rows:
+        session.execute(ChangeLog.__table__.insert(), [
+            {"tableName": table_name, "rowId": row_id, "action": action, "courseId": course_id}
+            for row_id, course_id in rows
+        ])
+
+
+def latest_change_id(session):
+    """Cursor of the newest change log row (0 when nothing has been logged yet)"""
+    return session.query(func.coalesce(func.max(ChangeLog.id), 0)).scalar()
+
+
+def changes_since(session, since, until, *table_names):
+    """
+    Collapses the log rows after cursor since (up to and including until) into the final action per row.
+    Returns {table name: {row id: action}}.
+    """
+    changes = {table_name: {} for table_name in table_names}
+
+    rows = (
+        session.query(ChangeLog.tableName, ChangeLog.rowId, ChangeLog.action)
+        .filter(ChangeLog.id > since, ChangeLog.id <= until, ChangeLog.tableName.in_(table_names))
+        .order_by(ChangeLog.id)
+        .yield_per(500)
+    )
+    for table_name, row_id, action in rows:
+        changes[table_name][row_id] = action
+
+    return changes
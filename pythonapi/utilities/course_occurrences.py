@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from database.db import Session
+from schemas.course_model import Course
+from schemas.course_occurrence_model import CourseOccurrence
+from utilities.expand_course import course_dates, batch_course_dates, format_course_recurrence, CourseEventTemplate
+
+
+def sync_course_occurrences(course, dates=None):
+    """
+    Rebuilds the stored class meetings of a course from its schedule.
+    Call before committing a course create/update; old rows are removed by the delete-orphan cascade.
+    dates can be passed in when they were already computed in bulk (see batch_course_dates).
+    """
+    if dates is None:
+        dates = course_dates(course)
+
+    course.occurrences = [
+        CourseOccurrence(
+            date=current,
+            start=datetime.combine(current, course.startTime),
+            end=datetime.combine(current, course.endTime)
+        )
+        for current in dates
+    ]
+
+
+def iter_course_events(session, start=None, end=None, course_id=None, course_ids=None, encoded=False):
+    """
+    Yields class meetings from the course_occurrence table (indexed range scan) as front-end events.
+    start/end are inclusive dates; course_id limits the result to a single course,
+    course_ids (a list or SQL subquery) to a set of courses.
+    With encoded=True every event is yielded already serialized to JSON bytes.
+    Rows are fetched from the cursor in batches, so the whole feed is never held in memory.
+    """
+    occurrences = (
+        session.query(CourseOccurrence, Course)
+        .join(Course, Course.id == CourseOccurrence.courseId)
+    )
+    if start:
+        occurrences = occurrences.filter(CourseOccurrence.date >= start)
+    if end:
+        occurrences = occurrences.filter(CourseOccurrence.date <= end)
+    if course_id is not None:
+        occurrences = occurrences.filter(CourseOccurrence.courseId == course_id)
+    if course_ids is not None:
+        occurrences = occurrences.filter(CourseOccurrence.courseId.in_(course_ids))
+
+    # One template per course: only start/end differ between its meetings
+    templates = {}
+
+    occurrences = occurrences.order_by(CourseOccurrence.date, CourseOccurrence.start).yield_per(500)
+    for occurrence, course in occurrences:
+        template = templates.get(course.id)
+        if template is None:
+            template = templates[course.id] = CourseEventTemplate(course)
+
+        if encoded:
+            yield template.encode(occurrence.start, occurrence.end)
+        else:
+            yield template.event(occurrence.start, occurrence.end)
+
+
+def iter_course_recurrences(session, start=None, end=None, course_ids=None):
+    """
+    Yields one recurrence-rule object per course whose term overlaps the inclusive start/end window.
+    course_ids (a list or SQL subquery) limits the result to a set of courses.
+    """
+    courses = session.query(Course)
+    if course_ids is not None:
+        courses = courses.filter(Course.id.in_(course_ids))
+    if start:
+        courses = courses.filter(Course.endDate >= start)
+    if end:
+        courses = courses.filter(Course.startDate <= end)
+
+    for course in courses.order_by(Course.id).yield_per(500):
+        yield format_course_recurrence(course)
+
+
+def load_course_events(session, start=None, end=None, course_id=None):
+    """Same as iter_course_events, but returns a list"""
+    return list(iter_course_events(session, start, end, course_id))
+
+
+def init_course_occurrences():
+    """Materializes class meetings for courses that were created before the course_occurrence table existed"""
+    with Session() as session:
+        courses = (
+            session.query(Course)
+            .filter(~Course.occurrences.any())
+            .all()
+        )
+        if not courses:
+            return
+
+        for course, dates in zip(courses, batch_course_dates(courses)):
+            sync_course_occurrences(course, dates)
+
+        session.commit()
+        print(f"Materialized class meetings for {len(courses)} course(s)")
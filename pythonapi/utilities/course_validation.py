@@ -3,6 +3,41 @@ from datetime import datetime
 
 from database.db import Session
 from schemas.course_model import Course
+from utilities.days_of_week import days_to_mask
+
+
+def find_schedule_conflicts(session, days_of_week, start_date, end_date, start_time, end_time, exclude_id=None):
+    """
+    Courses meeting on one of the same days, at an overlapping time, during an overlapping date range,
+    found with a single query: the day sets are intersected with a bitwise AND on Course.daysMask and
+    the date/time overlaps run on the indexed columns. exclude_id skips the course being updated.
+    """
+    conflicts = session.query(Course).filter(
+        Course.daysMask.op("&")(days_to_mask(days_of_week)) != 0,
+        Course.startDate <= end_date,
+        Course.endDate >= start_date,
+        Course.startTime < end_time,
+        Course.endTime > start_time
+    )
+    if exclude_id is not None:
+        conflicts = conflicts.filter(Course.id != exclude_id)
+
+    return conflicts.order_by(Course.courseName).all()
+
+
+def check_schedule_conflicts(session, days_of_week, start_date, end_date, start_time, end_time, exclude_id=None):
+    """Raises a ValueError listing every course the schedule conflicts with (see find_schedule_conflicts)"""
+    conflicts = find_schedule_conflicts(session, days_of_week, start_date, end_date, start_time, end_time,
+                                        exclude_id)
+    if not conflicts:
+        return
+
+    described = [
+        f"'{existing.courseName}' (Dates: {existing.startDate} to {existing.endDate}, "
+        f"Days: {existing.daysOfWeek}, Time: {existing.startTime} to {existing.endTime})"
+        for existing in conflicts
+    ]
+    raise ValueError(f"Error: This course conflicts with {', '.join(described)}")
 
 
 def check_course_overlap(course):
@@ -11,40 +46,18 @@ def check_course_overlap(course):
     entry_end_date = datetime.strptime(course["endDate"], "%Y-%m-%d").date()
     entry_start_time = datetime.strptime(course["startTime"], "%H:%M:%S").time()
     entry_end_time = datetime.strptime(course["endTime"], "%H:%M:%S").time()
-    entry_days = course["daysOfWeek"].split(",")
 
     with Session() as session:
-        existing_courses = session.query(Course).all()
+        check_schedule_conflicts(session, course["daysOfWeek"], entry_start_date, entry_end_date,
+                                 entry_start_time, entry_end_time)
 
-        for existing in existing_courses:
-            # Checking overlap of dates
-            date_overlap = entry_start_date <= existing.endDate and entry_end_date >= existing.startDate
 
-            if not date_overlap:
-                continue
-
-            # Checking overlap of days
-            day_overlap = False
-            existing_days = existing.daysOfWeek.split(",")
-
-            for day in entry_days:
-                if day in existing_days:
-                    day_overlap = True
-                    break
-
-            if not day_overlap:
-                continue
-
-            # Checking overlap of times
-            time_overlap = entry_start_time < existing.endTime and entry_end_time > existing.startTime
-
-            if not time_overlap:
-                continue
+def init_course_days_masks():
+    """Fills Course.daysMask for courses created before the column existed"""
+    with Session() as session:
+        courses = session.query(Course).filter(Course.daysMask == 0).all()
+        for course in courses:
+            course.daysMask = days_to_mask(course.daysOfWeek)
 
-            # If we get here, all three overlaps exist
-            raise ValueError(
-                f"Error: This course conflicts with '{existing.courseName}' "
-                f"(Dates: {existing.startDate} to {existing.endDate}, "
-                f"Days: {existing.daysOfWeek}, "
-                f"Time: {existing.startTime} to {existing.endTime})"
-            )
\ No newline at end of file
+        if courses:
+            session.commit()
@@ -0,0 +1,15 @@
+# Bit for each day code used in Course.daysOfWeek. Bit n is weekday n (Monday = 0), matching date.weekday()
+DAY_BITS = {"M": 1, "Tu": 2, "W": 4, "Th": 8, "F": 16}
+
+
+def days_to_mask(days_of_week):
+    """Turns a daysOfWeek string like 'M,W,F' into a weekday bitmask (M,W,F -> 0b10101)"""
+    mask = 0
+    for day in days_of_week.split(","):
+        mask |= DAY_BITS.get(day.strip(), 0)
+    return mask
+
+
+def mask_to_weekdays(mask):
+    """Turns a weekday bitmask back into a sorted list of weekday numbers (Monday = 0)"""
+    return [weekday for weekday in range(7) if mask & (1 << weekday)]
@@ -0,0 +1,27 @@
+from sqlalchemy import select, text
+
+from schemas.student_course_model import StudentCourse
+from schemas.student_model import Student
+
+
+def enrolled_course_ids(user_id):
+    """
+    SQL subquery of the ids of the courses a user (through their Student record) is enrolled in.
+    Use as Model.courseId.in_(enrolled_course_ids(user_id)) so the enrollment join runs in the same query.
+    """
+    return (
+        select(StudentCourse.courseId)
+        .join(Student, Student.id == StudentCourse.studentId)
+        .where(Student.userId == user_id)
+    )
+
+
+def remove_duplicate_enrollments(engine):
+    """Keeps the first of any repeated (student, course) enrollment, so the unique index can be created"""
+    with engine.begin() as connection:
+        removed = connection.execute(text(
+            "DELETE FROM student_course WHERE id NOT IN "
+            "(SELECT MIN(id) FROM student_course GROUP BY studentId, courseId)"
+        )).rowcount
+    if removed:
+        print(f"Removed {removed} duplicate enrollment(s)")
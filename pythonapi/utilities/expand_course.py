@@ -1,47 +1,200 @@
 from datetime import timedelta, datetime
 
+import numpy as np
 
-def expand_course(course):
-    """Turns a course into a bunch of singular events for front-end"""
+from services.fast_json import dumps_json
+from services.signed_downloads import signed_download_url
+from utilities.days_of_week import days_to_mask, mask_to_weekdays
+
+ONE_WEEK = timedelta(days=7)
+
+
+def course_dates(course, window_start=None, window_end=None):
+    """
+    Yields every date the course meets on, in order.
+    If window_start/window_end are given, only dates inside that (inclusive) range are returned.
+    """
+    # Only walk the part of the term that falls inside the requested window
+    first_day = course.startDate
+    last_day = course.endDate
+    if window_start and window_start > first_day:
+        first_day = window_start
+    if window_end and window_end < last_day:
+        last_day = window_end
+
+    # Parse daysOfWeek once into day offsets from Monday
+    weekday_offsets = [timedelta(days=weekday) for weekday in mask_to_weekdays(days_to_mask(course.daysOfWeek))]
+    if not weekday_offsets:
+        return
+
+    # Jump a week at a time from the Monday of the first week, only visiting the meeting days
+    week_start = first_day - timedelta(days=first_day.weekday())
+
+    while week_start <= last_day:
+        for offset in weekday_offsets:
+            current = week_start + offset
+            if current > last_day:
+                break
+            if current >= first_day:
+                yield current
+
+        # Go on to the next week!
+        week_start += ONE_WEEK
+
+
+def batch_course_dates(courses, window_start=None, window_end=None):
+    """
+    Meeting dates of many courses at once, computed with NumPy datetime64 arrays (for bulk callers).
+    Returns one sorted list of dates per course, in the same order as courses.
+    """
+    courses = list(courses)
+    if not courses:
+        return []
+
+    starts = np.array([course.startDate for course in courses], dtype="datetime64[D]")
+    ends = np.array([course.endDate for course in courses], dtype="datetime64[D]")
+    if window_start:
+        starts = np.maximum(starts, np.datetime64(window_start, "D"))
+    if window_end:
+        ends = np.minimum(ends, np.datetime64(window_end, "D"))
+    masks = np.array([days_to_mask(course.daysOfWeek) for course in courses], dtype=np.int64)
+
+    # 1970-01-01 was a Thursday, so the weekday (Monday = 0) of day number n is (n + 3) % 7
+    start_weekdays = (starts.astype(np.int64) + 3) % 7
+    course_indexes = np.arange(len(courses))
+
+    firsts, counts, owners = [], [], []
+    for weekday in range(7):
+        meets = (masks >> weekday) & 1 == 1
+        if not meets.any():
+            continue
+
+        # First date on this weekday, and how many weekly meetings fit before the end date
+        first = starts[meets] + (weekday - start_weekdays[meets]) % 7
+        span = (ends[meets] - first).astype(np.int64)
+        firsts.append(first)
+        counts.append(np.where(span >= 0, span // 7 + 1, 0))
+        owners.append(course_indexes[meets])
+
+    if not firsts:
+        return [[] for _ in courses]
+
+    firsts = np.concatenate(firsts)
+    counts = np.concatenate(counts)
+    owners = np.concatenate(owners)
+
+    # Expand every (first date, count) pair into its weekly run of dates
+    run_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    dates = np.repeat(firsts, counts) + run_offsets * 7
+    owners = np.repeat(owners, counts)
+
+    # Sort by course, then date, and split into one list per course
+    order = np.lexsort((dates, owners))
+    dates = dates[order].tolist()
+    boundaries = np.searchsorted(owners[order], course_indexes, side="right").tolist()
+
+    result = []
+    previous = 0
+    for boundary in boundaries:
+        result.append(dates[previous:boundary])
+        previous = boundary
+    return result
+
+
+class CourseEventTemplate:
+    """
+    The part of a course's meeting events that is the same for every meeting, built once per course.
+    event() and encode() only fill in start/end; encode() splices them into the pre-serialized JSON bytes.
+    """
+
+    def __init__(self, course):
+        self.fields = {
+            "id": course.id,
+            "title": course.courseName,
+            "start": "",
+            "end": "",
+            "allDay": False,
+            "type": "course",
+            "courseId": course.id,
+            "credits": course.credits,
+            "daysOfWeek": course.daysOfWeek,
+            "startTime": course.startTime.isoformat() if course.startTime else None,
+            "endTime": course.endTime.isoformat() if course.endTime else None,
+            "startDate": course.startDate.isoformat() if course.startDate else None,
+            "endDate": course.endDate.isoformat() if course.endDate else None,
+            "filename": course.filename,
+            "has_file": course.file_path is not None,
+            "file_url": signed_download_url(course.file_hash, course.content_type, course.filename)
+        }
+        self._parts = None
+
+    def event(self, start, end):
+        """Front-end JSON object for the meeting from start to end"""
+        event = self.fields.copy()
+        event["start"] = start.isoformat()
+        event["end"] = end.isoformat()
+        return event
+
+    def encode(self, start, end):
+        """Same as event(), already serialized to JSON bytes"""
+        if self._parts is None:
+            # Cut the serialized template around the empty start/end values. Keys are only written once and
+            # quotes inside string values are escaped, so the cuts are unambiguous.
+            head, tail = dumps_json(self.fields).split(b'"start":""', 1)
+            middle, tail = tail.split(b'"end":""', 1)
+            self._parts = (head + b'"start":"', b'"' + middle + b'"end":"', b'"' + tail)
+
+        prefix, middle, suffix = self._parts
+        return b"".join((prefix, start.isoformat().encode(), middle, end.isoformat().encode(), suffix))
+
+
+def format_course_event(course, start, end):
+    """Builds the front-end JSON object for one class meeting of a course"""
+    return CourseEventTemplate(course).event(start, end)
+
+
+def format_course_recurrence(course):
+    """
+    Builds a single front-end JSON object describing every class meeting of a course as a recurrence rule,
+    for clients that expand the meetings themselves (instead of one event per meeting).
+    """
+    return {
+        "id": course.id,
+        "title": course.courseName,
+        "allDay": False,
+        "type": "course",
+        "courseId": course.id,
+        "credits": course.credits,
+        "daysOfWeek": course.daysOfWeek,
+        "filename": course.filename,
+        "has_file": course.file_path is not None,
+        "file_url": signed_download_url(course.file_hash, course.content_type, course.filename),
+        "recurrence": {
+            # bit n set = meets on weekday n (Monday = 0)
+            "daysMask": days_to_mask(course.daysOfWeek),
+            "startTime": course.startTime.isoformat() if course.startTime else None,
+            "endTime": course.endTime.isoformat() if course.endTime else None,
+            "startDate": course.startDate.isoformat() if course.startDate else None,
+            "endDate": course.endDate.isoformat() if course.endDate else None,
+            # cancelled meetings are not modelled yet, so a course has no exception dates
+            "exdates": []
+        }
+    }
+
+
+def expand_course(course, window_start=None, window_end=None):
+    """
+    Turns a course into a bunch of singular events for front-end.
+    If window_start/window_end are given, only occurrences inside that (inclusive) date range are returned.
+    """
+    template = CourseEventTemplate(course)
     events = []
 
-    current = course.startDate
-    one_day = timedelta(days=1)
-
-    while current <= course.endDate:
-        weekday_number = current.weekday()
-
-        # If the course falls on this day of the week
-        if (("M" in course.daysOfWeek and weekday_number == 0) or
-            ("Tu" in course.daysOfWeek and weekday_number == 1) or
-            ("W" in course.daysOfWeek and weekday_number == 2) or
-            ("Th" in course.daysOfWeek and weekday_number == 3) or
-            ("F" in course.daysOfWeek and weekday_number == 4)):
-
-            # Combine the date and time into front-end friendly format
-            start = datetime.combine(current, course.startTime)
-            end = datetime.combine(current, course.endTime)
-
-            # Build JSON object
-            events.append({
-                "id": course.id,
-                "title": course.courseName,
-                "start": start.isoformat(),
-                "end": end.isoformat(),
-                "allDay": False,
-                "type": "course",
-                "courseId": course.id,
-                "credits": course.credits,
-                "daysOfWeek": course.daysOfWeek,
-                "startTime": course.startTime.isoformat() if course.startTime else None,
-                "endTime": course.endTime.isoformat() if course.endTime else None,
-                "startDate": course.startDate.isoformat() if course.startDate else None,
-                "endDate": course.endDate.isoformat() if course.endDate else None,
-                "filename": course.filename,
-                "has_file": course.file_path is not None
-            })
-
-        # Go on to the next day!
-        current += one_day
-
-    return events
\ No newline at end of file
+    for current in course_dates(course, window_start, window_end):
+        # Combine the date and time into front-end friendly format
+        start = datetime.combine(current, course.startTime)
+        end = datetime.combine(current, course.endTime)
+
+        events.append(template.event(start, end))
+
+    return events
@@ -0,0 +1,50 @@
+import os
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from services.config import BLOB_CACHE_MAX_AGE_SECONDS
+from services.data_version import etag_matches
+
+
+def not_modified_since(if_modified_since, mtime):
+    """Checks an If-Modified-Since header against a file's mtime (HTTP dates have whole-second precision)"""
+    if not if_modified_since:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def stored_file_response(request: Request, file_path, sha256, media_type, filename):
+    """
+    Serves a stored upload with validators: a strong ETag (the content hash), Last-Modified, and a 304
+    for a matching If-None-Match (or, without one, If-Modified-Since). Range / If-Range requests get
+    206 Partial Content from FileResponse, so PDF viewers can fetch just the pages they show.
+    Stored files are addressed by their content hash and never change, so browsers may cache them for a year
+    without revalidating. Blocking (stats the file): call it from a def route.
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except (FileNotFoundError, TypeError):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    headers = {
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": f"private, max-age={BLOB_CACHE_MAX_AGE_SECONDS}, immutable"
+    }
+    if sha256:
+        headers["ETag"] = f'"{sha256}"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = "ETag" in headers and etag_matches(if_none_match, headers["ETag"])
+    else:
+        not_modified = not_modified_since(request.headers.get("if-modified-since"), stat_result.st_mtime)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(file_path, media_type=media_type, headers=headers, filename=filename,
+                        stat_result=stat_result, content_disposition_type="inline")
@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.routing import APIRoute
+
+from services.config import UPLOAD_MAX_BYTES, UPLOAD_CHUNK_BYTES, UPLOAD_FORM_OVERHEAD_BYTES
+from utilities.blob_store import blob_temp_file, store_blob
+
+
+def upload_too_large():
+    return HTTPException(status_code=413,
+                         detail=f"File is larger than the {UPLOAD_MAX_BYTES // (1024 * 1024)} MB upload limit")
+
+
+def check_upload_request_size(request: Request):
+    """Rejects a multipart request whose Content-Length already says it carries more than the upload limit"""
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        return
+    try:
+        content_length = int(request.headers.get("content-length"))
+    except (TypeError, ValueError):
+        return
+    if content_length > UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD_BYTES:
+        raise upload_too_large()
+
+
+class UploadLimitRoute(APIRoute):
+    """
+    Route class for routers that take uploads: runs check_upload_request_size before FastAPI parses the form
+    (which it does before any dependency), so an oversized upload is refused without being spooled to disk.
+    Requests without a Content-Length (chunked) are still stopped by save_upload while the file is copied.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def size_checked_handler(request: Request):
+            check_upload_request_size(request)
+            return await handler(request)
+
+        return size_checked_handler
+
+
+def copy_upload(source, max_bytes=UPLOAD_MAX_BYTES, chunk_bytes=UPLOAD_CHUNK_BYTES):
+    """
+    Copies a file object into the blob store one chunk at a time, hashing it on the way.
+    The chunks go to a temp file that is renamed to its hash at the end (or dropped if that content is
+    already stored), so a failed or oversized upload never leaves a partial blob behind.
+    Returns (blob path, size, SHA-256 hex digest).
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    temp_file, temp_path = blob_temp_file()
+    try:
+        with temp_file:
+            while chunk := source.read(chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise upload_too_large()
+                digest.update(chunk)
+                temp_file.write(chunk)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        sha256 = digest.hexdigest()
+        return store_blob(temp_path, sha256), size, sha256
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def save_upload(file: UploadFile):
+    """
+    Streams an UploadFile into the blob store (see copy_upload), so the whole file is never held in memory.
+    Uploads whose size is known to be over the limit are rejected with a 413 before anything is written
+    (routers using UploadLimitRoute have already refused requests that say they are too large).
+    Blocking: call it from a def route, which FastAPI runs in its threadpool.
+    Returns {"path", "size", "sha256"}; store the sha256 in the row's file_hash, which is what keeps the blob alive.
+    """
+    if file.size is not None and file.size > UPLOAD_MAX_BYTES:
+        raise upload_too_large()
+
+    file.file.seek(0)
+    path, size, sha256 = copy_upload(file.file)
+    return {"path": str(path), "size": size, "sha256": sha256}
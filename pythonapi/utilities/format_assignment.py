@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from schemas.assignment_model import Assignment
+from schemas.course_model import Course
+from services.signed_downloads import signed_download_url
+
+
+def format_assignment(assignment_obj, course_name):
+    """Format an assignment object for front-end use"""
+    # Create datetime for calendar
+    due_datetime = datetime.combine(assignment_obj.dueDate, assignment_obj.dueTime)
+
+    return {
+        "id": assignment_obj.id,
+        "originalId": assignment_obj.id,
+        "title": assignment_obj.assignmentTitle,
+        "name": assignment_obj.assignmentTitle,
+        "description": assignment_obj.description,
+        "start": due_datetime.isoformat(),
+        "end": due_datetime.isoformat(),
+        "date": assignment_obj.dueDate.isoformat(),
+        "allDay": False,
+        "type": "assignment",
+        "courseId": assignment_obj.courseId,
+        "code": course_name if course_name else "Unknown",
+        "color": "#dc3545",
+        "worth": assignment_obj.worth,
+        "hasFile": bool(assignment_obj.file_path),
+        "fileUrl": signed_download_url(assignment_obj.file_hash, assignment_obj.content_type, assignment_obj.filename)
+    }
+
+
+def iter_assignment_events(session, *criteria):
+    """
+    Yields assignments joined with their course name (a single query), formatted for the front-end.
+    Any SQLAlchemy filter criteria (e.g. Assignment.dueDate >= start) are applied to the query.
+    """
+    assignments = (
+        session.query(Assignment, Course.courseName)
+        .outerjoin(Course, Course.id == Assignment.courseId)
+        .filter(*criteria)
+        .yield_per(500)
+    )
+
+    for assignment, course_name in assignments:
+        yield format_assignment(assignment, course_name)
+
+
+def load_assignment_events(session, *criteria):
+    """Same as iter_assignment_events, but returns a list"""
+    return list(iter_assignment_events(session, *criteria))
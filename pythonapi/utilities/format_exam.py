@@ -1,5 +1,7 @@
 from datetime import datetime, time
 
+from schemas.exam_model import Exam
+
 def format_exam(exam_obj):
     """
     returns an exam object to be used for the front-end calendar
@@ -19,4 +21,13 @@ def format_exam(exam_obj):
         "type": "exam",
         "courseId": exam_obj.courseId,
         "weight": exam_obj.weight
-    }
\ No newline at end of file
+    }
+
+
+def iter_exam_events(session, *criteria):
+    """
+    Yields exams formatted for the front-end calendar.
+    Any SQLAlchemy filter criteria (e.g. Exam.dateOf >= start) are applied to the query.
+    """
+    for exam in session.query(Exam).filter(*criteria).yield_per(500):
+        yield format_exam(exam)
@@ -0,0 +1,133 @@
+from datetime import date, datetime, timedelta, timezone
+
+from utilities.days_of_week import mask_to_weekdays
+
+# iCalendar day codes by weekday number (Monday = 0)
+ICS_DAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def ics_escape(text):
+    """Escapes a TEXT value (RFC 5545 section 3.3.11)"""
+    if text is None:
+        return ""
+    return (str(text)
+            .replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n"))
+
+
+def ics_line(line):
+    """Folds a content line to 75 octets and adds the CRLF line ending (RFC 5545 section 3.1)"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        # Don't cut a multi-byte character in half
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_datetime(iso_value):
+    """Turns an isoformat datetime string into a floating (local time) iCalendar DATE-TIME"""
+    return datetime.fromisoformat(iso_value).strftime(ICS_DATETIME_FORMAT)
+
+
+def first_meeting_date(recurrence):
+    """First date on or after the recurrence startDate that falls on one of its days (None if it never meets)"""
+    start_date = date.fromisoformat(recurrence["startDate"])
+    end_date = date.fromisoformat(recurrence["endDate"])
+    weekdays = mask_to_weekdays(recurrence["daysMask"])
+    if not weekdays:
+        return None
+
+    first = min(start_date + timedelta(days=(weekday - start_date.weekday()) % 7) for weekday in weekdays)
+    return first if first <= end_date else None
+
+
+def course_vevent(course_event, stamp):
+    """VEVENT lines for a course recurrence object (see format_course_recurrence): one event with a weekly RRULE"""
+    recurrence = course_event["recurrence"]
+    first = first_meeting_date(recurrence)
+    if first is None:
+        return
+
+    start = datetime.combine(first, datetime.strptime(recurrence["startTime"], "%H:%M:%S").time())
+    end = datetime.combine(first, datetime.strptime(recurrence["endTime"], "%H:%M:%S").time())
+    until = datetime.combine(date.fromisoformat(recurrence["endDate"]), datetime.max.time())
+    by_day = ",".join(ICS_DAYS[weekday] for weekday in mask_to_weekdays(recurrence["daysMask"]))
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:course-{course_event['id']}@coursetracker"
+    yield f"DTSTAMP:{stamp}"
+    yield f"SUMMARY:{ics_escape(course_event['title'])}"
+    yield f"DTSTART:{start.strftime(ICS_DATETIME_FORMAT)}"
+    yield f"DTEND:{end.strftime(ICS_DATETIME_FORMAT)}"
+    yield f"RRULE:FREQ=WEEKLY;BYDAY={by_day};UNTIL={until.strftime(ICS_DATETIME_FORMAT)}"
+    for exdate in recurrence["exdates"]:
+        yield f"EXDATE:{datetime.combine(date.fromisoformat(exdate), start.time()).strftime(ICS_DATETIME_FORMAT)}"
+    yield "CATEGORIES:Course"
+    yield "END:VEVENT"
+
+
+def assignment_vevent(assignment_event, stamp):
+    """VEVENT lines for a formatted assignment (see format_assignment)"""
+    yield "BEGIN:VEVENT"
+    yield f"UID:assignment-{assignment_event['id']}@coursetracker"
+    yield f"DTSTAMP:{stamp}"
+    yield f"SUMMARY:{ics_escape(assignment_event['code'] + ': ' + assignment_event['title'])}"
+    if assignment_event["description"]:
+        yield f"DESCRIPTION:{ics_escape(assignment_event['description'])}"
+    yield f"DTSTART:{ics_datetime(assignment_event['start'])}"
+    yield f"DTEND:{ics_datetime(assignment_event['end'])}"
+    yield "CATEGORIES:Assignment"
+    yield "END:VEVENT"
+
+
+def exam_vevent(exam_event, stamp):
+    """VEVENT lines for a formatted exam (see format_exam)"""
+    yield "BEGIN:VEVENT"
+    yield f"UID:exam-{exam_event['id']}@coursetracker"
+    yield f"DTSTAMP:{stamp}"
+    yield f"SUMMARY:{ics_escape(exam_event['title'])}"
+    yield f"DTSTART:{ics_datetime(exam_event['start'])}"
+    yield f"DTEND:{ics_datetime(exam_event['end'])}"
+    yield "CATEGORIES:Exam"
+    yield "END:VEVENT"
+
+
+def calendar_lines(name, course_events, assignment_events, exam_events):
+    """
+    Yields a whole VCALENDAR as folded CRLF lines, one event at a time.
+    Courses are written once with a recurrence rule rather than once per class meeting.
+    """
+    stamp = datetime.now(timezone.utc).strftime(ICS_DATETIME_FORMAT) + "Z"
+
+    def lines():
+        yield "BEGIN:VCALENDAR"
+        yield "VERSION:2.0"
+        yield "PRODID:-//Course Tracker//Calendar Feed//EN"
+        yield "CALSCALE:GREGORIAN"
+        yield "METHOD:PUBLISH"
+        yield f"X-WR-CALNAME:{ics_escape(name)}"
+        for course_event in course_events:
+            yield from course_vevent(course_event, stamp)
+        for assignment_event in assignment_events:
+            yield from assignment_vevent(assignment_event, stamp)
+        for exam_event in exam_events:
+            yield from exam_vevent(exam_event, stamp)
+        yield "END:VCALENDAR"
+
+    for line in lines():
+        yield ics_line(line)
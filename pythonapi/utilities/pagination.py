@@ -0,0 +1,94 @@
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+
+# Largest page a list endpoint hands out in one request
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value, last_id):
+    """Opaque cursor for the row after (sort_value, last_id)"""
+    if isinstance(sort_value, (date, datetime, time)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, last_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor, sort_column):
+    """Turns a cursor back into (sort_value, last_id), with the sort value in the column's Python type"""
+    try:
+        sort_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        python_type = sort_column.type.python_type
+        if sort_value is not None and python_type in (date, datetime, time):
+            sort_value = python_type.fromisoformat(sort_value)
+        return sort_value, int(last_id)
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, sort_column, id_column, limit=None, cursor=None, descending=False, entity=lambda row: row):
+    """
+    Orders query by (sort_column, id_column) and, if limit is given, returns one keyset page of it.
+    The cursor is the position of the last row of the previous page, so every page is an index range scan
+    no matter how deep it is. entity picks the model object out of a row (for multi-entity queries).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_column)
+        position = tuple_(sort_column, id_column)
+        if descending:
+            query = query.filter(position < tuple_(sort_value, last_id))
+        else:
+            query = query.filter(position > tuple_(sort_value, last_id))
+
+    if limit is None:
+        return query.all(), None
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = entity(rows[-1])
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def page_headers(next_cursor):
+    """Response headers announcing the next page"""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def keyset_paging(sort_columns, id_column, entity=lambda row: row):
+    """
+    Dependency factory for list endpoints paged with keyset_page. Adds the sort (a key of sort_columns, whose
+    values should be indexed columns), order, limit and cursor query parameters, and returns page(query),
+    which orders query by them and returns (rows, page headers); with limit, one page is returned and the
+    next page's cursor is sent in the X-Next-Cursor header.
+    """
+    def paging(
+            sort: Literal[tuple(sort_columns)] = next(iter(sort_columns)),
+            order: Literal["asc", "desc"] = "asc",
+            limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+            cursor: Optional[str] = None
+    ):
+        def page(query):
+            rows, next_cursor = keyset_page(query, sort_columns[sort], id_column, limit, cursor, order == "desc",
+                                            entity)
+            return rows, page_headers(next_cursor)
+
+        return page
+
+    return paging
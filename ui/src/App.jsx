@@ -142,6 +142,7 @@ function App() {
             courseId: event.courseId,
             originalId: event.id,
             hasFile: event.has_file,
+            fileUrl: event.file_url,
             filename: event.filename,
             description: event.description,
             worth: event.worth,
@@ -170,6 +171,26 @@ function App() {
     }
   }, [authUser, fetchAllEvents]);
 
+  // Listen for changes pushed by the server instead of polling
+  useEffect(() => {
+    if (!authUser) {
+      return;
+    }
+
+    const token = localStorage.getItem('token');
+    const source = new EventSource(`${API_BASE_URL}/changes/stream?token=${encodeURIComponent(token)}`);
+    const calendarTables = ['course', 'assignment', 'exam', 'student_course'];
+
+    source.addEventListener('change', (message) => {
+      const change = JSON.parse(message.data);
+      if (change.action === 'resync' || change.tables.some(table => calendarTables.includes(table))) {
+        fetchAllEvents();
+      }
+    });
+
+    return () => source.close();
+  }, [authUser, fetchAllEvents]);
+
   // Add course event handler
   const handleAddCourse = (courseEvent) => {
     if (courseEvent.id) {
@@ -196,14 +217,6 @@ function App() {
     fetchAllEvents();
   };
 
-  // Filter upcoming assignments and exams
-  const upcomingItems = events.filter(event => {
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-    return (event.type === 'assignment' || event.type === 'exam') &&
-        new Date(event.date) >= today;
-  });
-
   return (
       <div className="min-h-screen flex flex-col bg-base-200" data-theme="corporate">
         {/* Toast notifications */}
@@ -276,7 +289,7 @@ function App() {
                 path="/upcoming"
                 element={
                   <RequireAuth>
-                    <Upcoming courses={upcomingItems} onItemDeleted={handleEventDeleted} />
+                    <Upcoming refreshKey={events} onItemDeleted={handleEventDeleted} />
                   </RequireAuth>
                 }
             />
@@ -70,8 +70,8 @@ function AssignmentCard({ item, courseFiles, onDelete, deleting }) {
         return '';
     };
 
-    // Check if course has a file
-    const courseHasFile = courseFiles && courseFiles[item.courseId];
+    // Signed download URL of the course's syllabus, if it has one
+    const courseFileUrl = courseFiles && courseFiles[item.courseId]?.fileUrl;
 
     const handleDelete = () => {
         if (confirm(`Are you sure you want to delete "${item.title || item.name}"?`)) {
@@ -146,9 +146,9 @@ function AssignmentCard({ item, courseFiles, onDelete, deleting }) {
                         Delete
                     </button>
                     <div className="flex gap-2">
-                        {item.hasFile && (
+                        {item.fileUrl && (
                             <a
-                                href={`http://localhost:8080/api/view-assignment/${item.originalId || item.id}`}
+                                href={`http://localhost:8080${item.fileUrl}`}
                                 target="_blank"
                                 rel="noopener noreferrer"
                                 className="btn btn-outline btn-primary btn-sm gap-1"
@@ -157,9 +157,9 @@ function AssignmentCard({ item, courseFiles, onDelete, deleting }) {
                                 View File
                             </a>
                         )}
-                        {courseHasFile && (
+                        {courseFileUrl && (
                             <a
-                                href={`http://localhost:8080/api/view-course/${item.courseId}`}
+                                href={`http://localhost:8080${courseFileUrl}`}
                                 target="_blank"
                                 rel="noopener noreferrer"
                                 className="btn btn-outline btn-sm gap-1"
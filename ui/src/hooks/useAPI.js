@@ -460,7 +460,8 @@ export function useCourseFiles() {
                 if (course.has_file) {
                     fileMap[course.id] = {
                         filename: course.filename,
-                        file_path: course.file_path
+                        file_path: course.file_path,
+                        fileUrl: course.file_url
                     };
                 }
             });
@@ -480,6 +481,36 @@ export function useCourseFiles() {
 }
 
 
+/**
+ * Hook to fetch the user's overdue / due today / upcoming assignments and exams
+ * (refetched whenever refreshKey changes). Without a horizon (in days) every future item is included.
+ */
+export function useUpcoming(refreshKey, horizon = null) {
+    const [agenda, setAgenda] = useState({ overdue: [], dueToday: [], upcoming: [] });
+    const [loading, setLoading] = useState(true);
+    const [error, setError] = useState(null);
+
+    const fetchUpcoming = useCallback(async () => {
+        setLoading(true);
+        setError(null);
+        try {
+            const data = await apiFetch(horizon === null ? '/upcoming' : `/upcoming?horizon=${horizon}`);
+            setAgenda(data);
+        } catch (err) {
+            setError(err.message);
+        } finally {
+            setLoading(false);
+        }
+    }, [horizon]);
+
+    useEffect(() => {
+        fetchUpcoming();
+    }, [fetchUpcoming, refreshKey]);
+
+    return { agenda, loading, error, refetch: fetchUpcoming };
+}
+
+
 /**
  * Hook to fetch user's enrolled course IDs
  */
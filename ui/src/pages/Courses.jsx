@@ -256,9 +256,9 @@ function CourseCard({ course, isEnrolled, onAction, onDelete, loading, deleteLoa
                     </button>
 
                     <div className="flex gap-2">
-                        {course.hasFile && (
+                        {course.fileUrl && (
                             <a
-                                href={`http://localhost:8080/api/view-course/${course.id}`}
+                                href={`http://localhost:8080${course.fileUrl}`}
                                 target="_blank"
                                 rel="noopener noreferrer"
                                 className="btn btn-ghost btn-sm gap-1"
@@ -1,57 +1,20 @@
-import { useMemo } from 'react';
 import toast from 'react-hot-toast';
 import { HiOutlineClipboardDocumentList, HiOutlineFaceSmile } from 'react-icons/hi2';
-import { useCourseFiles, useAssignmentMutations, useExamMutations } from '../hooks/useApi';
+import { useCourseFiles, useUpcoming, useAssignmentMutations, useExamMutations } from '../hooks/useApi';
 import AssignmentCard from '../components/AssignmentCard';
 import LoadingSpinner from '../components/LoadingSpinner';
 
-function Upcoming({ courses, onItemDeleted }) {
+function Upcoming({ refreshKey, onItemDeleted }) {
     const { courseFiles, loading: filesLoading } = useCourseFiles();
+    const { agenda, loading: agendaLoading } = useUpcoming(refreshKey);
     const { deleteAssignment, loading: assignmentLoading } = useAssignmentMutations();
     const { deleteExam, loading: examLoading } = useExamMutations();
 
     const deleting = assignmentLoading || examLoading;
 
-    // Sort by date and filter future items
-    const sortedItems = useMemo(() => {
-        const today = new Date();
-        today.setHours(0, 0, 0, 0);
-
-        return courses
-            .filter(item => {
-                const itemDate = new Date(item.start || item.date);
-                itemDate.setHours(0, 0, 0, 0);
-                // Include items from today onwards and past due items (up to 7 days ago)
-                const weekAgo = new Date(today);
-                weekAgo.setDate(weekAgo.getDate() - 7);
-                return itemDate >= weekAgo;
-            })
-            .sort((a, b) => {
-                const dateA = new Date(a.start || a.date);
-                const dateB = new Date(b.start || b.date);
-                return dateA - dateB;
-            });
-    }, [courses]);
-
-    // Group items by status
-    const { overdue, today: dueToday, upcoming } = useMemo(() => {
-        const now = new Date();
-        now.setHours(0, 0, 0, 0);
-        const todayEnd = new Date(now);
-        todayEnd.setHours(23, 59, 59, 999);
-
-        return sortedItems.reduce((acc, item) => {
-            const itemDate = new Date(item.start || item.date);
-            if (itemDate < now) {
-                acc.overdue.push(item);
-            } else if (itemDate <= todayEnd) {
-                acc.today.push(item);
-            } else {
-                acc.upcoming.push(item);
-            }
-            return acc;
-        }, { overdue: [], today: [], upcoming: [] });
-    }, [sortedItems]);
+    // The server buckets and sorts the items (past due items go back 7 days)
+    const { overdue, dueToday, upcoming } = agenda;
+    const itemCount = overdue.length + dueToday.length + upcoming.length;
 
     const handleDelete = async (item) => {
         let result;
@@ -69,7 +32,7 @@ function Upcoming({ courses, onItemDeleted }) {
         }
     };
 
-    if (filesLoading) {
+    if (filesLoading || (agendaLoading && itemCount === 0)) {
         return <LoadingSpinner message="Loading..." fullScreen />;
     }
 
@@ -86,7 +49,7 @@ function Upcoming({ courses, onItemDeleted }) {
                 </p>
             </div>
 
-            {sortedItems.length === 0 ? (
+            {itemCount === 0 ? (
                 <div className="card bg-base-100 shadow-xl">
                     <div className="card-body items-center text-center py-16">
                         <HiOutlineFaceSmile className="h-16 w-16 text-success mb-4" />